@@ -0,0 +1,47 @@
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from textnode import TextNode, TextType
+from utils import *
+
+
+def chained_text_to_textnodes(text):
+    nodes = [TextNode(text, TextType.TEXT)]
+    nodes = split_nodes_delimiter(nodes, "**", TextType.BOLD)
+    nodes = split_nodes_delimiter(nodes, "**", TextType.BOLD)
+    nodes = split_nodes_delimiter(nodes, "_", TextType.ITALIC)
+    nodes = split_nodes_delimiter(nodes, "`", TextType.CODE)
+    nodes = split_nodes_image(nodes)
+    nodes = split_nodes_link(nodes)
+    return nodes
+
+
+def paragraphs(count):
+    paragraph = (
+        "Plain words about the **history** of Middle-earth, with an _aside_ and "
+        "a `snippet` plus a [link](/blog/tom) and an ![image](/images/tom.png) "
+        "followed by a long stretch of ordinary prose that has no markup at all."
+    )
+    return [f"{paragraph} Paragraph {i}." for i in range(count)]
+
+
+def bench(name, func, texts, repeat=5):
+    best = min(timeit.repeat(lambda: [func(text) for text in texts], number=1, repeat=repeat))
+    print(f"{name:<28}{best * 1000:10.2f} ms")
+    return best
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    texts = paragraphs(count)
+    print(f"{count} paragraphs")
+    chained = bench("chained split_nodes_*", chained_text_to_textnodes, texts)
+    single = bench("single-pass scanner", text_to_textnodes, texts)
+    print(f"speedup: {chained / single:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+import utils
+from textnode import TextType
+from utils import *
+
+
+class DictHTMLNode():
+    def __init__(self, tag = None, value = None, children = None, props = None):
+        self.tag = tag
+        self.value = value
+        self.children = children
+        self.props = props
+
+
+class DictLeafNode(DictHTMLNode):
+    def __init__(self, tag, value, props = None):
+        super().__init__(tag, value, None, props)
+
+
+class DictParentNode(DictHTMLNode):
+    def __init__(self, tag, children):
+        super().__init__(tag, None, children, None)
+
+
+class DictTextNode():
+    def __init__(self, text, text_type, url = None):
+        self.text = text
+        self.text_type = text_type
+        self.url = url
+
+
+def dict_text_node_to_html(node):
+    if node.text_type in (TextType.BOLD, TextType.ITALIC) and INLINE_PATTERN.search(node.text):
+        tag = "b" if node.text_type == TextType.BOLD else "i"
+        return DictParentNode(tag, [dict_text_node_to_html(child) for child in text_to_textnodes(node.text)])
+    html_map = {
+        TextType.TEXT: DictLeafNode(None, node.text),
+        TextType.BOLD: DictLeafNode("b", node.text),
+        TextType.ITALIC: DictLeafNode("i", node.text),
+        TextType.CODE: DictLeafNode("code", node.text),
+        TextType.LINK: DictLeafNode("a", node.text, f"href={node.url}"),
+        TextType.IMAGE: DictLeafNode("img", "", f"src={node.url} alt={node.text}")
+    }
+    return html_map.get(node.text_type)
+
+
+DICT_NODES = {
+    "TextNode": DictTextNode,
+    "LeafNode": DictLeafNode,
+    "ParentNode": DictParentNode,
+    "text_node_to_html": dict_text_node_to_html,
+}
+
+
+def dict_markdown_to_html_tree(markdown):
+    saved = {name: getattr(utils, name) for name in DICT_NODES}
+    for name, value in DICT_NODES.items():
+        setattr(utils, name, value)
+    try:
+        return markdown_to_html_tree(markdown)
+    finally:
+        for name, value in saved.items():
+            setattr(utils, name, value)
+
+
+def document(size_mb):
+    section = (
+        "## Section {i}\n\n"
+        "Plain words about the **history** of Middle-earth, with an _aside_ and "
+        "a `snippet` plus a [link](/blog/tom) and an ![image](/images/tom.png).\n\n"
+        "- first item with **bold**\n- second item with _italic_\n- third item\n\n"
+        "1. one\n2. two\n3. three\n\n"
+        "> a quote about _Tolkien_\n\n"
+    )
+    parts = []
+    size = 0
+    i = 0
+    while size < size_mb * 1024 * 1024:
+        part = section.format(i=i)
+        parts.append(part)
+        size += len(part)
+        i += 1
+    return "# Title\n\n" + "".join(parts)
+
+
+def measure(name, func, markdown):
+    start = time.perf_counter()
+    tree = func(markdown)
+    elapsed = time.perf_counter() - start
+    del tree
+
+    tracemalloc.start()
+    tree = func(markdown)
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del tree
+
+    print(name)
+    print(f"  parse time: {elapsed * 1000:.1f} ms ({len(markdown) / 1024 / 1024 / elapsed:.1f} MB/s)")
+    print(f"  tree size:  {current / 1024 / 1024:.1f} MB")
+    print(f"  peak alloc: {peak / 1024 / 1024:.1f} MB")
+    return peak
+
+
+def main():
+    size_mb = float(sys.argv[1]) if len(sys.argv) > 1 else 4
+    markdown = document(size_mb)
+    print(f"input: {len(markdown) / 1024 / 1024:.2f} MB")
+    before = measure("dict-backed nodes", dict_markdown_to_html_tree, markdown)
+    after = measure("__slots__ nodes", markdown_to_html_tree, markdown)
+    print(f"peak reduction: {(1 - after / before) * 100:.0f}%")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from corpus import generate_corpus
+from search import SearchIndex
+
+
+def page_sources(content):
+    pages = []
+    for dirpath, _, filenames in os.walk(content):
+        for filename in sorted(filenames):
+            if filename.endswith(".md"):
+                source = os.path.join(dirpath, filename)
+                pages.append((source, os.path.relpath(source, content)[:-len(".md")] + ".html"))
+    return sorted(pages)
+
+
+def build(pages, root, prefix_length):
+    index = SearchIndex(os.path.join(root, "cache", "search.json"), os.path.join(root, "docs"), "", prefix_length)
+    start = time.perf_counter()
+    for source, page_key in pages:
+        index.update(source, page_key)
+    index.retain([page_key for _, page_key in pages])
+    index.write()
+    index.save()
+    return index, time.perf_counter() - start
+
+
+def shard_sizes(root):
+    search = os.path.join(root, "docs", "search")
+    return [os.path.getsize(os.path.join(search, name)) for name in os.listdir(search)
+            if name.endswith(".json") and name not in ("docs.json", "index.json")]
+
+
+def main():
+    sizes = [int(size) for size in (sys.argv[1] if len(sys.argv) > 1 else "100,1000").split(",")]
+    prefix_length = int(sys.argv[2]) if len(sys.argv) > 2 else 2
+    print(f"{'pages':>8} {'full':>10} {'1 changed':>10} {'shards':>7} {'total KB':>9} {'max KB':>7} {'mean KB':>8}")
+    for count in sizes:
+        with tempfile.TemporaryDirectory() as root:
+            generate_corpus(root, count, 40, images=0)
+            pages = page_sources(os.path.join(root, "content"))
+            _, full = build(pages, root, prefix_length)
+            with open(pages[0][0], "a", encoding="utf-8") as file:
+                file.write("\nA freshly added paragraph about palantiri.\n")
+            _, incremental = build(pages, root, prefix_length)
+            sizes = shard_sizes(root)
+            print(f"{count:>8} {full * 1000:8.1f}ms {incremental * 1000:8.1f}ms {len(sizes):>7} "
+                  f"{sum(sizes) / 1024:9.1f} {max(sizes) / 1024:7.1f} {sum(sizes) / len(sizes) / 1024:8.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+import os
+import random
+import shutil
+import sys
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+WORDS = (
+    "the ring of power was forged in the fires of mount doom by sauron "
+    "while elves dwarves and men kept their own rings hidden from the shadow "
+    "hobbits of the shire cared little for such things and preferred a quiet "
+    "meal in the afternoon with pipeweed and good company under the party tree"
+).split()
+
+
+def words(rng, count):
+    return " ".join(rng.choice(WORDS) for _ in range(count))
+
+
+def inline_text(rng, count, images):
+    parts = []
+    for _ in range(count):
+        roll = rng.random()
+        if roll < 0.08:
+            parts.append(f"**{words(rng, 2)}**")
+        elif roll < 0.14:
+            parts.append(f"_{words(rng, 2)}_")
+        elif roll < 0.18:
+            parts.append(f"`{rng.choice(WORDS)}()`")
+        elif roll < 0.22:
+            parts.append(f"[{words(rng, 3)}](/section-{rng.randrange(10)}/)")
+        elif roll < 0.23 and images:
+            parts.append(f"![{words(rng, 2)}](/images/img-{rng.randrange(images)}.png)")
+        else:
+            parts.append(words(rng, rng.randint(3, 8)))
+    return " ".join(parts)
+
+
+def generate_markdown(rng, title, blocks, images=10):
+    out = [f"# {title}"]
+    for _ in range(blocks):
+        roll = rng.random()
+        if roll < 0.10:
+            out.append(f"{'#' * rng.randint(2, 4)} {words(rng, 4)}")
+        elif roll < 0.55:
+            lines = [inline_text(rng, rng.randint(4, 12), images) for _ in range(rng.randint(1, 3))]
+            out.append("\n".join(lines))
+        elif roll < 0.70:
+            out.append("\n".join(f"- {inline_text(rng, rng.randint(1, 4), images)}" for _ in range(rng.randint(2, 6))))
+        elif roll < 0.80:
+            out.append("\n".join(f"{i + 1}. {inline_text(rng, rng.randint(1, 3), images)}" for i in range(rng.randint(2, 6))))
+        elif roll < 0.90:
+            out.append("\n".join(f"> {inline_text(rng, rng.randint(2, 5), images)}" for _ in range(rng.randint(1, 3))))
+        else:
+            code = "\n".join(f"    {words(rng, 4)}" for _ in range(rng.randint(2, 8)))
+            out.append(f"```\n{code}\n```")
+    return "\n\n".join(out) + "\n"
+
+
+def generate_corpus(root, pages=100, blocks=40, images=10, image_size=16 * 1024, seed=0):
+    rng = random.Random(seed)
+    content = os.path.join(root, "content")
+    static = os.path.join(root, "static", "images")
+    os.makedirs(content, exist_ok=True)
+    os.makedirs(static, exist_ok=True)
+    shutil.copy(os.path.join(ROOT, "template.html"), os.path.join(root, "template.html"))
+    shutil.copy(os.path.join(ROOT, "static", "index.css"), os.path.join(root, "static", "index.css"))
+    for i in range(images):
+        with open(os.path.join(static, f"img-{i}.png"), "wb") as file:
+            file.write(rng.randbytes(image_size))
+    for i in range(pages):
+        page_dir = os.path.join(content, f"section-{i % 10}", f"page-{i}")
+        os.makedirs(page_dir, exist_ok=True)
+        with open(os.path.join(page_dir, "index.md"), "w", encoding="utf-8") as file:
+            file.write(generate_markdown(rng, f"Page {i}", blocks, images))
+    return root
+
+
+def main():
+    if len(sys.argv) < 2:
+        print("Usage: python3 bench/corpus.py <output_dir> [pages] [blocks]")
+        sys.exit(1)
+    pages = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+    blocks = int(sys.argv[3]) if len(sys.argv) > 3 else 40
+    generate_corpus(sys.argv[1], pages, blocks)
+
+
+if __name__ == "__main__":
+    main()
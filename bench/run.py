@@ -0,0 +1,140 @@
+import argparse
+import contextlib
+import datetime
+import io
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+import main as build
+from utils import *
+from corpus import generate_corpus
+
+
+def best_time(func, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def read_pages(content):
+    pages = []
+    for dirpath, _, filenames in os.walk(content):
+        for filename in sorted(filenames):
+            if filename.endswith(".md"):
+                with open(os.path.join(dirpath, filename), encoding="utf-8") as file:
+                    pages.append(file.read())
+    return pages
+
+
+def full_build(root, args):
+    cwd = os.getcwd()
+    os.chdir(root)
+    try:
+        shutil.rmtree(build.public_path, ignore_errors=True)
+        with contextlib.redirect_stdout(io.StringIO()):
+            build.main(args)
+    finally:
+        os.chdir(cwd)
+
+
+def bench_size(pages, blocks, repeat):
+    with tempfile.TemporaryDirectory() as root:
+        generate_corpus(root, pages, blocks)
+        texts = read_pages(os.path.join(root, "content"))
+        block_lists = [markdown_to_blocks(text) for text in texts]
+        paragraphs = [block for blocks in block_lists for block in blocks
+                      if block_to_block_type(block) == BlockType.PARAGRAPH]
+        output = os.path.join(root, "copy")
+
+        def copy_static():
+            shutil.rmtree(output, ignore_errors=True)
+            os.makedirs(output)
+            build.copy_files(os.path.join(root, "static"), output)
+
+        return {
+            "markdown_to_blocks": best_time(lambda: [markdown_to_blocks(text) for text in texts], repeat),
+            "text_to_textnodes": best_time(lambda: [text_to_textnodes(block) for block in paragraphs], repeat),
+            "markdown_to_html_node": best_time(lambda: [markdown_to_html_node(text) for text in texts], repeat),
+            "extract_title": best_time(lambda: [extract_title(text) for text in texts], repeat),
+            "copy_files": best_time(copy_static, repeat),
+            "main": best_time(lambda: full_build(root, ["/"]), repeat),
+        }
+
+
+def run(args):
+    results = {}
+    for pages in args.sizes:
+        print(f"Benchmarking {pages} pages of {args.blocks} blocks")
+        results[str(pages)] = bench_size(pages, args.blocks, args.repeat)
+        for name, seconds in results[str(pages)].items():
+            print(f"  {name:<24}{seconds * 1000:10.2f} ms")
+    report = {
+        "meta": {
+            "date": datetime.datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "blocks": args.blocks,
+            "repeat": args.repeat,
+        },
+        "results": results,
+    }
+    with open(args.output, "w", encoding="utf-8") as file:
+        json.dump(report, file, indent=2)
+    print(f"Wrote {args.output}")
+
+
+def compare(args):
+    with open(args.baseline, encoding="utf-8") as file:
+        baseline = json.load(file)["results"]
+    with open(args.current, encoding="utf-8") as file:
+        current = json.load(file)["results"]
+    regressions = 0
+    for size, timings in current.items():
+        for name, seconds in timings.items():
+            before = baseline.get(size, {}).get(name)
+            if not before:
+                continue
+            change = (seconds - before) / before * 100
+            flag = ""
+            if change > args.threshold:
+                flag = "  REGRESSION"
+                regressions += 1
+            print(f"{size:>8} {name:<24}{before * 1000:10.2f} ms {seconds * 1000:10.2f} ms {change:+7.1f}%{flag}")
+    if regressions:
+        print(f"{regressions} regression(s) above {args.threshold}%")
+        sys.exit(1)
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="bench/run.py")
+    commands = parser.add_subparsers(dest="command", required=True)
+    run_parser = commands.add_parser("run", help="time the pipeline on generated corpora")
+    run_parser.add_argument("--sizes", type=lambda value: [int(size) for size in value.split(",")],
+                            default=[10, 100, 1000], help="comma separated page counts")
+    run_parser.add_argument("--blocks", type=int, default=40, help="blocks per page")
+    run_parser.add_argument("--repeat", type=int, default=3)
+    run_parser.add_argument("--output", default="bench/results.json")
+    compare_parser = commands.add_parser("compare", help="flag regressions against a saved baseline")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("current")
+    compare_parser.add_argument("--threshold", type=float, default=10.0,
+                                help="percent slowdown reported as a regression")
+    args = parser.parse_args()
+    if args.command == "run":
+        run(args)
+    else:
+        compare(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+import json
+import os
+import shutil
+import threading
+
+from manifest import hash_file, open_atomic
+from sync import COPIED, LINKED, SKIPPED, fast_copy, replace_with_copy, replace_with_link
+
+
+class HashIndex():
+    def __init__(self, index_path):
+        self.index_path = index_path
+        self.entries = {}
+        self.lock = threading.Lock()
+        try:
+            with open(index_path, "r", encoding="utf-8") as file:
+                self.entries = json.load(file)
+        except (OSError, ValueError):
+            pass
+
+    def hash(self, path):
+        stat = os.stat(path)
+        entry = self.entries.get(path)
+        if entry and entry[0] == stat.st_size and entry[1] == stat.st_mtime_ns:
+            return entry[2]
+        digest = hash_file(path)
+        with self.lock:
+            self.entries[path] = [stat.st_size, stat.st_mtime_ns, digest]
+        return digest
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.index_path) or ".", exist_ok=True)
+        with open(self.index_path, "w", encoding="utf-8") as file:
+            json.dump(self.entries, file, indent=1, sort_keys=True)
+
+
+class DedupStore():
+    def __init__(self, store_path, hash_index, root_path, rewrite_urls=False):
+        self.store_path = store_path
+        self.hash_index = hash_index
+        self.root_path = root_path
+        self.rewrite_urls = rewrite_urls
+        self.lock = threading.Lock()
+        self.groups = {}
+        self.sizes = {}
+
+    def url(self, dest_file):
+        return "/" + os.path.relpath(dest_file, self.root_path).replace(os.sep, "/")
+
+    def object_path(self, digest):
+        return os.path.join(self.store_path, digest[:2], digest)
+
+    def register(self, source_file, dest_file):
+        digest = self.hash_index.hash(source_file)
+        with self.lock:
+            self.groups.setdefault(digest, []).append(self.url(dest_file))
+            self.sizes[digest] = os.path.getsize(source_file)
+        return digest
+
+    def materialize(self, source_file, dest_file, digest):
+        stored = self.object_path(digest)
+        if not os.path.exists(stored):
+            os.makedirs(os.path.dirname(stored), exist_ok=True)
+            temp_path = f"{stored}.{threading.get_ident()}.tmp"
+            fast_copy(source_file, temp_path)
+            shutil.copystat(source_file, temp_path)
+            # Linking instead of replacing lets the first writer win, so
+            # every duplicate ends up linked to the same stored inode.
+            try:
+                os.link(temp_path, stored)
+            except FileExistsError:
+                pass
+            except OSError:
+                os.replace(temp_path, stored)
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+        if os.path.exists(dest_file) and os.path.samefile(stored, dest_file):
+            return SKIPPED, 0
+        if replace_with_link(stored, dest_file):
+            return LINKED, 0
+        replace_with_copy(stored, dest_file)
+        return COPIED, os.path.getsize(dest_file)
+
+    def shared_url(self, digest):
+        extension = os.path.splitext(self.groups[digest][0])[1]
+        return f"/_assets/{digest[:16]}{extension}"
+
+    def publish_shared(self):
+        url_map = {}
+        outputs = []
+        for digest, urls in self.groups.items():
+            if len(urls) < 2:
+                continue
+            shared_url = self.shared_url(digest)
+            shared_file = os.path.join(self.root_path, shared_url[1:])
+            os.makedirs(os.path.dirname(shared_file), exist_ok=True)
+            self.materialize(self.object_path(digest), shared_file, digest)
+            outputs.append(shared_file)
+            for url in urls:
+                url_map[url] = shared_url
+        return url_map, outputs
+
+    def summary(self):
+        outputs = sum(len(urls) for urls in self.groups.values())
+        saved = sum(self.sizes[digest] * (len(urls) - 1) for digest, urls in self.groups.items())
+        return f"Dedup: {len(self.groups)} unique assets for {outputs} outputs, {saved} duplicate bytes shared"
+
+
+class Fingerprinter():
+    def __init__(self, hash_index, root_path, hash_length=10):
+        self.hash_index = hash_index
+        self.root_path = root_path
+        self.hash_length = hash_length
+        self.lock = threading.Lock()
+        self.urls = {}
+
+    def url(self, path):
+        return "/" + os.path.relpath(path, self.root_path).replace(os.sep, "/")
+
+    def publish(self, source_file, dest_file):
+        digest = self.hash_index.hash(source_file)
+        name, extension = os.path.splitext(dest_file)
+        fingerprinted = f"{name}.{digest[:self.hash_length]}{extension}"
+        if not (os.path.exists(fingerprinted) and os.path.samefile(dest_file, fingerprinted)):
+            if not replace_with_link(dest_file, fingerprinted):
+                replace_with_copy(dest_file, fingerprinted)
+        with self.lock:
+            self.urls[self.url(dest_file)] = self.url(fingerprinted)
+        return fingerprinted
+
+    def outputs(self):
+        return [os.path.join(self.root_path, url[1:]) for url in self.urls.values()]
+
+    def write_manifest(self, path, urls=None):
+        with open_atomic(path) as file:
+            json.dump(self.urls if urls is None else urls, file, indent=1, sort_keys=True)
@@ -0,0 +1,81 @@
+import hashlib
+import os
+from collections import OrderedDict
+
+from utils import block_to_html
+
+# Bump whenever block_to_html output changes so cached fragments are not reused.
+RENDERER_VERSION = "1"
+
+
+class BlockCache():
+    def __init__(self, max_entries=10000, directory=None):
+        self.max_entries = max_entries
+        self.directory = directory
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def key(self, block, block_type):
+        text = f"{RENDERER_VERSION}\0{block_type.value}\0{block}"
+        return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+    def disk_path(self, key):
+        return os.path.join(self.directory, key[:2], key)
+
+    def fragment(self, block, block_type, html_node=None):
+        key = self.key(block, block_type)
+        html = self.entries.get(key)
+        if html is not None:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return html
+        if self.directory:
+            try:
+                with open(self.disk_path(key), "r", encoding="utf-8") as file:
+                    html = file.read()
+            except OSError:
+                pass
+            else:
+                self.disk_hits += 1
+                self.remember(key, html)
+                return html
+        self.misses += 1
+        if html_node is None:
+            html_node = block_to_html(block, block_type)
+        html = html_node.to_html() if html_node else ""
+        self.remember(key, html)
+        if self.directory:
+            self.store(key, html)
+        return html
+
+    def remember(self, key, html):
+        self.entries[key] = html
+        if len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    def store(self, key, html):
+        path = self.disk_path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as file:
+            file.write(html)
+        os.replace(temp_path, path)
+
+    def counts(self):
+        return (self.hits, self.disk_hits, self.misses)
+
+    def add_counts(self, counts):
+        hits, disk_hits, misses = counts
+        self.hits += hits
+        self.disk_hits += disk_hits
+        self.misses += misses
+
+    def summary(self):
+        total = self.hits + self.disk_hits + self.misses
+        rate = (self.hits + self.disk_hits) / total * 100 if total else 0
+        return (f"Block cache: {self.hits} memory hits, {self.disk_hits} disk hits, "
+                f"{self.misses} misses ({rate:.1f}% hit rate)")
@@ -0,0 +1,99 @@
+import argparse
+import json
+import socket
+import struct
+import sys
+
+DEFAULT_SOCKET = ".cache/render.sock"
+HEADER = struct.Struct(">I")
+MAX_MESSAGE = 256 * 1024 * 1024
+
+
+def read_exact(sock, size):
+    data = bytearray()
+    while len(data) < size:
+        chunk = sock.recv(size - len(data))
+        if not chunk:
+            if data:
+                raise Exception("Connection closed in the middle of a message")
+            return None
+        data += chunk
+    return bytes(data)
+
+
+def send_message(sock, message):
+    payload = json.dumps(message).encode("utf-8")
+    sock.sendall(HEADER.pack(len(payload)) + payload)
+
+
+def recv_message(sock):
+    header = read_exact(sock, HEADER.size)
+    if header is None:
+        return None
+    (size,) = HEADER.unpack(header)
+    if size > MAX_MESSAGE:
+        raise Exception(f"Message of {size} bytes is larger than {MAX_MESSAGE}")
+    payload = read_exact(sock, size)
+    if payload is None:
+        raise Exception("Connection closed in the middle of a message")
+    return json.loads(payload)
+
+
+def request(message, socket_path=DEFAULT_SOCKET):
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.connect(socket_path)
+        send_message(sock, message)
+        response = recv_message(sock)
+    if response is None:
+        raise Exception("Render daemon closed the connection without replying")
+    if not response.get("ok"):
+        raise Exception(response.get("error", "Render daemon failed"))
+    return response
+
+
+def read_source(path):
+    if path == "-":
+        return sys.stdin.read()
+    with open(path, "r", encoding="utf-8") as file:
+        return file.read()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="main.py client")
+    parser.add_argument("--socket", default=DEFAULT_SOCKET)
+    commands = parser.add_subparsers(dest="command", required=True)
+    render = commands.add_parser("render", help="render markdown to body HTML")
+    render.add_argument("file", nargs="?", default="-")
+    page = commands.add_parser("page", help="render markdown into the site template")
+    page.add_argument("file", nargs="?", default="-")
+    page.add_argument("--path", default="", help="output path of the page, used by {{ path }}")
+    page.add_argument("--date", help="date shown by {{ date }}, defaults to today")
+    rebuild = commands.add_parser("build", help="rebuild one file under content/ or static/ into the output")
+    rebuild.add_argument("path")
+    commands.add_parser("ping")
+    args = parser.parse_args(argv)
+
+    if args.command == "render":
+        message = {"op": "render", "markdown": read_source(args.file)}
+    elif args.command == "page":
+        message = {"op": "page", "markdown": read_source(args.file), "path": args.path, "date": args.date}
+    elif args.command == "build":
+        message = {"op": "build", "path": args.path}
+    else:
+        message = {"op": "ping"}
+    try:
+        response = request(message, args.socket)
+    except Exception as error:
+        print(error, file=sys.stderr)
+        return 1
+    if "html" in response:
+        sys.stdout.write(response["html"])
+    elif "output" in response:
+        print(response["output"])
+    else:
+        print("pong")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
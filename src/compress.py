@@ -0,0 +1,89 @@
+import gzip
+import hashlib
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from manifest import open_atomic
+
+COMPRESSIBLE_EXTENSIONS = {".html", ".css", ".svg", ".js", ".json"}
+
+
+def compress_file(path, level=9, previous_hash=None):
+    with open(path, "rb") as file:
+        data = file.read()
+    digest = hashlib.sha256(data).hexdigest()
+    gzip_path = f"{path}.gz"
+    if digest == previous_hash and os.path.exists(gzip_path):
+        return digest, None
+    compressed = gzip.compress(data, compresslevel=level, mtime=0)
+    with open_atomic(gzip_path, "wb") as file:
+        file.write(compressed)
+    return digest, (len(data), len(compressed))
+
+
+def remove_gzip(root_path, keys):
+    removed = 0
+    for key in keys:
+        gzip_path = f"{os.path.join(root_path, key)}.gz"
+        if os.path.exists(gzip_path):
+            os.remove(gzip_path)
+            removed += 1
+    return removed
+
+
+class Compressor():
+    def __init__(self, index_path, level=9, min_size=1024, jobs=None):
+        self.index_path = index_path
+        self.level = level
+        self.min_size = min_size
+        self.pool = ThreadPoolExecutor(max_workers=jobs)
+        self.lock = threading.Lock()
+        self.seen = set()
+        self.futures = []
+        self.index = {}
+        try:
+            with open(index_path, "r", encoding="utf-8") as file:
+                self.index = json.load(file)
+        except (OSError, ValueError):
+            pass
+        self.compressed = 0
+        self.unchanged = 0
+        self.bytes_in = 0
+        self.bytes_out = 0
+
+    def add(self, path):
+        if os.path.splitext(path)[1].lower() not in COMPRESSIBLE_EXTENSIONS:
+            return
+        with self.lock:
+            if path in self.seen:
+                return
+            self.seen.add(path)
+        key = os.path.abspath(path).replace(os.sep, "/")
+        if os.path.getsize(path) < self.min_size:
+            if os.path.exists(f"{path}.gz"):
+                os.remove(f"{path}.gz")
+            return
+        future = self.pool.submit(compress_file, path, self.level, self.index.get(key))
+        self.futures.append((key, future))
+
+    def finish(self):
+        self.pool.shutdown(wait=True)
+        for key, future in self.futures:
+            digest, sizes = future.result()
+            self.index[key] = digest
+            if sizes is None:
+                self.unchanged += 1
+            else:
+                self.compressed += 1
+                self.bytes_in += sizes[0]
+                self.bytes_out += sizes[1]
+        self.futures = []
+        os.makedirs(os.path.dirname(self.index_path) or ".", exist_ok=True)
+        with open_atomic(self.index_path) as file:
+            json.dump(self.index, file, indent=1, sort_keys=True)
+
+    def summary(self):
+        return (f"Gzip: {self.compressed} compressed ({self.bytes_in} -> {self.bytes_out} bytes), "
+                f"{self.unchanged} unchanged")
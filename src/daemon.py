@@ -0,0 +1,121 @@
+import argparse
+import datetime
+import os
+import socketserver
+import threading
+
+import main as build
+import serve
+from cache import BlockCache
+from client import DEFAULT_SOCKET, recv_message, send_message
+from document import parse_document
+from template import load_template
+
+
+class RenderDaemon():
+    def __init__(self, base_path="", cache_size=10000):
+        self.base_path = base_path
+        self.cache = BlockCache(cache_size)
+        # BlockCache is not thread safe, and rendering holds the GIL anyway,
+        # so connections are served concurrently but render one at a time.
+        self.lock = threading.Lock()
+        self.template = None
+        self.template_mtime = None
+        self.requests = 0
+
+    def current_template(self):
+        mtime = os.stat(build.template_path).st_mtime_ns
+        if mtime != self.template_mtime:
+            self.template = load_template(build.template_path, self.base_path)
+            self.template_mtime = mtime
+        return self.template
+
+    def handle(self, message):
+        op = message.get("op")
+        with self.lock:
+            self.requests += 1
+            if op == "ping":
+                return {"ok": True}
+            if op == "render":
+                return {"ok": True, "html": self.render(message["markdown"])}
+            if op == "page":
+                return {"ok": True, "html": self.page(message["markdown"], message.get("path") or "",
+                                                      message.get("date"))}
+            if op == "build":
+                return {"ok": True, "output": self.rebuild(message["path"])}
+        raise Exception(f"Unknown request {op!r}")
+
+    def render(self, markdown):
+        template = self.current_template()
+        chunks = []
+        parse_document(markdown, self.cache).write_html(template.url_writer(chunks.append))
+        return "".join(chunks)
+
+    def page(self, markdown, path="", date=None):
+        date = date or datetime.date.today().isoformat()
+        chunks = []
+        build.render_document(parse_document(markdown, self.cache), self.current_template(), chunks.append, path, date)
+        return "".join(chunks)
+
+    def rebuild(self, path):
+        absolute = os.path.abspath(path)
+        for root in (build.content_path, build.static_path):
+            if os.path.commonpath([absolute, os.path.abspath(root)]) == os.path.abspath(root):
+                source_file = os.path.normpath(os.path.join(root, os.path.relpath(absolute, os.path.abspath(root))))
+                return serve.rebuild(source_file, self.current_template(), self.cache)
+        raise Exception(f"{path} is not under {build.content_path} or {build.static_path}")
+
+
+class RenderHandler(socketserver.BaseRequestHandler):
+    def handle(self):
+        while True:
+            try:
+                message = recv_message(self.request)
+            except OSError:
+                return
+            except Exception as error:
+                send_message(self.request, {"ok": False, "error": str(error)})
+                return
+            if message is None:
+                return
+            try:
+                response = self.server.daemon.handle(message)
+            except Exception as error:
+                response = {"ok": False, "error": str(error)}
+            send_message(self.request, response)
+
+
+class RenderServer(socketserver.ThreadingUnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, socket_path, daemon):
+        self.daemon = daemon
+        super().__init__(socket_path, RenderHandler)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="main.py daemon")
+    parser.add_argument("base_path", nargs="?", default="")
+    parser.add_argument("--socket", default=DEFAULT_SOCKET)
+    parser.add_argument("--block-cache-size", type=int, default=10000,
+                        help="number of block fragments kept in memory")
+    args = parser.parse_args(argv)
+    base_path = "" if args.base_path == "/" else args.base_path
+    build.base_path = base_path
+
+    os.makedirs(os.path.dirname(args.socket) or ".", exist_ok=True)
+    if os.path.exists(args.socket):
+        os.remove(args.socket)
+    server = RenderServer(args.socket, RenderDaemon(base_path, args.block_cache_size))
+    print(f"Render daemon listening on {args.socket}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        os.remove(args.socket)
+
+
+if __name__ == "__main__":
+    main()
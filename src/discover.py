@@ -0,0 +1,94 @@
+import fnmatch
+import hashlib
+import os
+import time
+
+PAGE_EXTENSIONS = {".md", ".markdown"}
+
+
+def is_page(path):
+    return os.path.splitext(path)[1].lower() in PAGE_EXTENSIONS
+
+
+def matches(path, patterns):
+    return any(fnmatch.fnmatchcase(path, pattern) for pattern in patterns)
+
+
+def shard_of(path, count):
+    digest = hashlib.sha1(path.replace(os.sep, "/").encode("utf-8")).digest()
+    return int.from_bytes(digest[:8], "big") % count
+
+
+def parse_shard(value):
+    index, _, count = value.partition("/")
+    try:
+        index, count = int(index), int(count)
+    except ValueError:
+        raise Exception(f"Invalid shard {value!r}, expected i/N") from None
+    if count < 1 or not 0 <= index < count:
+        raise Exception(f"Invalid shard {value!r}, expected 0 <= i < N")
+    return index, count
+
+
+def shard_path(path, index, count):
+    return f"{path.rstrip(os.sep)}.shard-{index}-of-{count}"
+
+
+def scan_files(root, include=(), exclude=()):
+    directories = []
+    files = []
+    stack = [""]
+    while stack:
+        directory = stack.pop()
+        with os.scandir(os.path.join(root, directory)) as entries:
+            for entry in entries:
+                relative = f"{directory}/{entry.name}" if directory else entry.name
+                if matches(relative, exclude):
+                    continue
+                if entry.is_dir():
+                    directories.append(relative)
+                    stack.append(relative)
+                elif not include or matches(relative, include):
+                    files.append(relative)
+    directories.sort()
+    files.sort()
+    return directories, files
+
+
+class WorkList():
+    def __init__(self, include=(), exclude=(), shard=None):
+        self.include = include
+        self.exclude = exclude
+        self.shard = shard
+        self.directories = []
+        self.pages = []
+        self.assets = []
+        self.elapsed = 0
+
+    def scan(self, source_path, dest_path, pages=True):
+        start = time.perf_counter()
+        directories, files = scan_files(source_path, self.include, self.exclude)
+        self.directories.extend(os.path.join(dest_path, directory) for directory in directories)
+        for relative in files:
+            source_file = os.path.join(source_path, relative)
+            if self.shard and shard_of(source_file, self.shard[1]) != self.shard[0]:
+                continue
+            if pages and is_page(relative):
+                self.pages.append((source_file, os.path.join(dest_path, os.path.splitext(relative)[0] + ".html")))
+            else:
+                self.assets.append((source_file, os.path.join(dest_path, relative)))
+        self.elapsed += time.perf_counter() - start
+
+    def selects(self, relative):
+        parts = relative.split("/")
+        if any(matches("/".join(parts[:index]), self.exclude) for index in range(1, len(parts) + 1)):
+            return False
+        return not self.include or matches(relative, self.include)
+
+    def make_directories(self):
+        for directory in self.directories:
+            os.makedirs(directory, exist_ok=True)
+
+    def summary(self):
+        return (f"Discovery: {len(self.pages)} pages and {len(self.assets)} assets "
+                f"in {len(self.directories)} directories ({self.elapsed:.4f}s)")
@@ -0,0 +1,87 @@
+from parentnode import ParentNode
+from utils import BlockType, block_to_html, iter_numbered_blocks
+
+
+def iter_leaves(node):
+    if node.children is None:
+        yield node
+        return
+    for child in node.children:
+        yield from iter_leaves(child)
+
+
+def heading_of(block):
+    marker = block.split()[0]
+    return len(marker), block[len(marker):].strip()
+
+
+class Document():
+    def __init__(self, typed_blocks, cache=None, line_numbers=None):
+        self.blocks = list(typed_blocks)
+        self.line_numbers = line_numbers
+        self.cache = cache
+        self.html_nodes = {}
+
+    def html_node(self, index):
+        if index not in self.html_nodes:
+            block, block_type = self.blocks[index]
+            self.html_nodes[index] = block_to_html(block, block_type)
+        return self.html_nodes[index]
+
+    @property
+    def nodes(self):
+        nodes = (self.html_node(index) for index in range(len(self.blocks)))
+        return [html_node for html_node in nodes if html_node]
+
+    @property
+    def tree(self):
+        return ParentNode("div", self.nodes)
+
+    @property
+    def title(self):
+        for index, (block, block_type) in enumerate(self.blocks):
+            if block_type == BlockType.HEADING and len(block.split()[0]) == 1:
+                return self.html_node(index).children[0].to_html()
+        raise Exception("No Title were found")
+
+    @property
+    def headings(self):
+        return [heading_of(block) for block, block_type in self.blocks if block_type == BlockType.HEADING]
+
+    @property
+    def links(self):
+        return [(leaf.value, leaf.props[len("href="):]) for leaf in self.leaves("a")]
+
+    @property
+    def images(self):
+        images = []
+        for leaf in self.leaves("img"):
+            src, _, alt = leaf.props[len("src="):].partition(" alt=")
+            images.append((alt, src))
+        return images
+
+    def leaves(self, tag):
+        for html_node in self.nodes:
+            for leaf in iter_leaves(html_node):
+                if leaf.tag == tag:
+                    yield leaf
+
+    def write_html(self, write):
+        if self.cache is None:
+            self.tree.write_html(write)
+            return
+        write("<div>")
+        for index, (block, block_type) in enumerate(self.blocks):
+            write(self.cache.fragment(block, block_type, self.html_nodes.get(index)))
+        write("</div>")
+
+
+def parse_document(text, cache=None):
+    if isinstance(text, str):
+        text = text.split("\n")
+    line_numbers = []
+    blocks = []
+    for number, block, block_type in iter_numbered_blocks(text):
+        line_numbers.append(number)
+        blocks.append((block, block_type))
+    return Document(blocks, cache, line_numbers)
@@ -1,6 +1,8 @@
 
 
 class HTMLNode():
+    __slots__ = ("tag", "value", "children", "props")
+
     def __init__(self, tag = None, value = None, children = None, props = None):
         self.tag = tag
         self.value = value
@@ -10,6 +12,9 @@ class HTMLNode():
     def to_html(self):
         raise NotImplementedError
 
+    def write_html(self, write):
+        write(self.to_html())
+
     def props_to_html(self):
         if not self.props:
             return ""
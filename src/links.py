@@ -0,0 +1,102 @@
+import json
+import os
+import posixpath
+from urllib.parse import unquote, urlsplit
+
+from manifest import open_atomic
+from pageinfo import read_page_info
+
+
+def candidates(url, page_key):
+    parts = urlsplit(url)
+    if parts.scheme or parts.netloc:
+        return None
+    path = unquote(parts.path)
+    if not path:
+        return [page_key]
+    if path.startswith("/"):
+        key = posixpath.normpath(path[1:] or ".")
+    else:
+        key = posixpath.normpath(posixpath.join(posixpath.dirname(page_key), path))
+    if key == ".":
+        return ["index.html"]
+    if key.startswith("../"):
+        return []
+    if path.endswith("/"):
+        return [f"{key}/index.html"]
+    return [key, f"{key}/index.html", f"{key}.html"]
+
+
+class LinkChecker():
+    def __init__(self, index_path):
+        self.index_path = index_path
+        self.pages = {}
+        self.outputs = []
+        try:
+            with open(index_path, "r", encoding="utf-8") as file:
+                data = json.load(file)
+            self.pages = data["pages"]
+            self.outputs = data["outputs"]
+        except (OSError, ValueError, KeyError):
+            pass
+        self.changed = set()
+        self.checked = 0
+        self.references = 0
+
+    def update(self, source_file, page_key, info=None):
+        stat = os.stat(source_file)
+        stamp = [stat.st_mtime_ns, stat.st_size]
+        entry = self.pages.get(page_key)
+        if entry and entry["source"] == source_file and entry["stamp"] == stamp:
+            return
+        if info is None:
+            info = read_page_info(source_file, ("links",))
+        self.pages[page_key] = {"source": source_file, "stamp": stamp, "references": info["references"],
+                                "targets": [], "broken": []}
+        self.changed.add(page_key)
+
+    def retain(self, page_keys):
+        page_keys = set(page_keys)
+        for page_key in list(self.pages):
+            if page_key not in page_keys:
+                del self.pages[page_key]
+
+    def check(self, outputs):
+        outputs = set(outputs)
+        removed = set(self.outputs) - outputs
+        for page_key, entry in self.pages.items():
+            if not (page_key in self.changed or entry["broken"] or removed.intersection(entry["targets"])):
+                continue
+            self.checked += 1
+            targets = []
+            broken = []
+            for line, kind, url in entry["references"]:
+                keys = candidates(url, page_key)
+                if keys is None:
+                    continue
+                self.references += 1
+                target = next((key for key in keys if key in outputs), None)
+                if target is None:
+                    broken.append([line, kind, url])
+                else:
+                    targets.append(target)
+            entry["targets"] = targets
+            entry["broken"] = broken
+        self.outputs = sorted(outputs)
+        return self.broken()
+
+    def broken(self):
+        return [
+            (entry["source"], line, kind, url)
+            for _, entry in sorted(self.pages.items())
+            for line, kind, url in entry["broken"]
+        ]
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.index_path) or ".", exist_ok=True)
+        with open_atomic(self.index_path) as file:
+            json.dump({"pages": self.pages, "outputs": self.outputs}, file)
+
+    def summary(self, broken):
+        return (f"Links: {len(broken)} broken, {self.references} references checked "
+                f"on {self.checked} of {len(self.pages)} pages")
@@ -1,84 +1,579 @@
+import argparse
 import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
 import shutil
 from utils import *
+from manifest import BuildManifest, clone_tree, hash_data, open_atomic, publish_tree
+from template import load_template
+from document import parse_document
+from discover import WorkList, parse_shard, shard_path
+from pipeline import PagePipeline
+from metadata import MetadataIndex, listing_html
+from links import LinkChecker
+from pageinfo import PageInfo, document_info
+from search import SearchIndex
+from minify import Minifier
+from sync import AssetSync
+from profiler import BuildProfiler, NULL_PROFILER
+from cache import BlockCache
+from compress import Compressor, remove_gzip
+from assets import DedupStore, Fingerprinter, HashIndex
+import datetime
 import sys
 
 public_path = "docs"
 static_path = "static"
 content_path = "content"
 template_path = "template.html"
+cache_path = ".cache"
 base_path = ""
+stream_threshold = 64 * 1024 * 1024
 
 
-def main():
+class BuildOptions():
+    def __init__(self, jobs=1, profiler=NULL_PROFILER, cache=None, compressor=None, pipeline=None, minifier=None,
+                 fields=(), buffered=False):
+        self.jobs = jobs
+        self.profiler = profiler
+        self.cache = cache
+        self.compressor = compressor
+        self.pipeline = pipeline
+        self.minifier = minifier
+        self.fields = fields
+        self.buffered = buffered
+
+
+DEFAULT_OPTIONS = BuildOptions()
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(prog="main.py")
+    parser.add_argument("base_path", nargs="?", default="")
+    parser.add_argument("--incremental", action="store_true",
+                        help="only re-render or re-copy outputs whose inputs changed")
+    parser.add_argument("--jobs", "-j", type=int, default=1,
+                        help="number of processes used to render pages")
+    parser.add_argument("--compare", choices=["mtime", "hash"], default="mtime",
+                        help="how to detect unchanged static files (size and mtime, or content hash)")
+    parser.add_argument("--link", action="store_true",
+                        help="hardlink static files into the output instead of copying them")
+    parser.add_argument("--copy-jobs", type=int, default=None,
+                        help="number of threads used to copy static files")
+    parser.add_argument("--block-cache", choices=["off", "memory", "disk"], default="off",
+                        help="reuse rendered HTML for unchanged blocks, in memory or also under --cache-dir")
+    parser.add_argument("--block-cache-size", type=int, default=10000,
+                        help="number of block fragments kept in memory")
+    parser.add_argument("--cache-dir", default=cache_path,
+                        help="directory for persistent build caches")
+    parser.add_argument("--dedup", action="store_true",
+                        help="store each distinct static file once and hardlink duplicates to it")
+    parser.add_argument("--dedup-urls", action="store_true",
+                        help="also point references to duplicated files at one shared URL (implies --dedup)")
+    parser.add_argument("--fingerprint", action="store_true",
+                        help="publish static files as name.<hash>.ext, rewrite references and write asset-manifest.json")
+    parser.add_argument("--gzip", action="store_true",
+                        help="write .gz copies of html, css, svg and js outputs")
+    parser.add_argument("--gzip-level", type=int, default=9, choices=range(1, 10), metavar="1-9")
+    parser.add_argument("--gzip-min-size", type=int, default=1024,
+                        help="smallest output size in bytes worth compressing")
+    parser.add_argument("--gzip-jobs", type=int, default=None,
+                        help="number of threads used for compression")
+    parser.add_argument("--pipeline", action="store_true",
+                        help="overlap reading, rendering and writing pages using background I/O threads")
+    parser.add_argument("--read-ahead", type=int, default=16,
+                        help="number of page sources the pipeline reads ahead of the renderer")
+    parser.add_argument("--write-behind", type=int, default=16,
+                        help="number of rendered pages the pipeline may have waiting to be written")
+    parser.add_argument("--io-jobs", type=int, default=None,
+                        help="number of threads the pipeline uses for file reads and writes")
+    parser.add_argument("--include", action="append", default=[], metavar="GLOB",
+                        help="only build files whose path under static/ or content/ matches (repeatable)")
+    parser.add_argument("--exclude", action="append", default=[], metavar="GLOB",
+                        help="skip files and directories whose path under static/ or content/ matches (repeatable)")
+    parser.add_argument("--collections", action="store_true",
+                        help="index page metadata under --cache-dir and generate paginated listing pages per directory")
+    parser.add_argument("--per-page", type=int, default=10,
+                        help="number of pages listed on each collection page")
+    parser.add_argument("--sort", choices=["date", "title"], default="date",
+                        help="order of pages in collection listings")
+    parser.add_argument("--search", action="store_true",
+                        help="write a client-side search index sharded by term prefix under search/")
+    parser.add_argument("--search-prefix", type=int, default=2,
+                        help="number of leading characters that pick a term's search shard")
+    parser.add_argument("--minify", action="store_true",
+                        help="collapse whitespace and strip comments in generated pages, leaving pre and code alone")
+    parser.add_argument("--check-links", action="store_true",
+                        help="report markdown links and images that point at no output, checking changed pages only")
+    parser.add_argument("--strict-links", action="store_true",
+                        help="fail the build on broken links (implies --check-links)")
+    parser.add_argument("--shard", metavar="i/N",
+                        help="build only shard i of N into its own directory, to be combined with `main.py merge`")
+    parser.add_argument("--atomic-publish", action="store_true",
+                        help="build into a staging copy of the output directory and swap it in when done")
+    parser.add_argument("--profile", action="store_true",
+                        help="time each build phase per page and print a summary")
+    parser.add_argument("--profile-top", type=int, default=10,
+                        help="number of slowest files listed by --profile")
+    parser.add_argument("--trace", metavar="FILE",
+                        help="write a Chrome trace / Perfetto JSON file (implies --profile)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
     global base_path
-    if len(sys.argv) > 2:
-        print("Usage: python3 main.py <baseline_path>")
-        sys.exit(1)
-    if len(sys.argv) == 2:
-        base_path = sys.argv[1]
-        if base_path == "/":
-            base_path = ""
-    if os.path.exists(public_path):
-        items = os.listdir(public_path)
-        for file in items:
-            path = os.path.join(public_path, file)
-            if os.path.isfile(path):
-                os.remove(path)
-        copy_files(static_path, public_path)
-        generate_page(content_path, template_path, public_path)
+    argv = sys.argv[1:] if argv is None else argv
+    if argv and argv[0] == "serve":
+        import serve
+        return serve.main(argv[1:])
+    if argv and argv[0] == "daemon":
+        import daemon
+        return daemon.main(argv[1:])
+    if argv and argv[0] == "client":
+        import client
+        return client.main(argv[1:])
+    if argv and argv[0] == "merge":
+        import merge
+        return merge.main(argv[1:])
+    args = parse_args(argv)
+    base_path = args.base_path
+    if base_path == "/":
+        base_path = ""
+    profiler = BuildProfiler() if args.profile or args.trace else NULL_PROFILER
+    output_path = public_path
+    shard = parse_shard(args.shard) if args.shard else None
+    if shard:
+        if (args.fingerprint or args.dedup_urls or args.atomic_publish or args.collections or args.search
+                or args.check_links or args.strict_links):
+            raise Exception("--shard cannot be combined with --fingerprint, --dedup-urls, --atomic-publish, "
+                            "--collections, --search or --check-links")
+        output_path = shard_path(public_path, *shard)
+    if args.atomic_publish:
+        output_path = f"{public_path.rstrip(os.sep)}.staging"
+        clone_tree(public_path, output_path)
+    os.makedirs(output_path, exist_ok=True)
+    manifest = BuildManifest(output_path, template_path, base_path, args.incremental)
+    if shard:
+        manifest.meta = {
+            "shard": list(shard),
+            "base_path": base_path,
+            "template_hash": manifest.template_hash,
+            "include": args.include,
+            "exclude": args.exclude,
+        }
+    if args.minify:
+        manifest.page_options["minify"] = True
+    compressor = None
+    if args.gzip:
+        compressor = Compressor(os.path.join(args.cache_dir, "gzip.json"),
+                                args.gzip_level, args.gzip_min_size, args.gzip_jobs)
+    hash_index = HashIndex(os.path.join(args.cache_dir, "asset-hashes.json"))
+    dedup = None
+    if args.dedup or args.dedup_urls:
+        dedup = DedupStore(os.path.join(args.cache_dir, "objects"), hash_index, output_path, args.dedup_urls)
+    fingerprint = Fingerprinter(hash_index, output_path) if args.fingerprint else None
+    assets = AssetSync(args.compare, args.link, args.copy_jobs, profiler,
+                       compressor.add if compressor else None, dedup, fingerprint)
+    cache = None
+    if args.block_cache != "off":
+        block_dir = os.path.join(args.cache_dir, "blocks") if args.block_cache == "disk" else None
+        cache = BlockCache(args.block_cache_size, block_dir)
+    with profiler.phase("discover"):
+        work = WorkList(args.include, args.exclude, shard)
+        work.scan(static_path, output_path, pages=False)
+        work.scan(content_path, output_path)
+        work.make_directories()
+    print(work.summary())
+    pipeline = PagePipeline(args.read_ahead, args.write_behind, args.io_jobs) if args.pipeline else None
+    minifier = Minifier() if args.minify else None
+    fields = tuple(name for name, enabled in (("collections", args.collections), ("search", args.search),
+                                              ("links", args.check_links or args.strict_links)) if enabled)
+    options = BuildOptions(args.jobs, profiler, cache, compressor, pipeline, minifier, fields)
+    copy_files(static_path, output_path, manifest, assets, work)
+    rendered, infos = generate_page(content_path, template_path, output_path, manifest, assets, work, options)
+    if args.include or args.exclude:
+        manifest.carry_over(lambda inputs: filtered_out(work, inputs.get("source", "")))
+    if args.collections:
+        index = MetadataIndex(os.path.join(args.cache_dir, "pages.sqlite"))
+        with profiler.phase("index"):
+            paths = []
+            for source_file, output_file in work.pages:
+                paths.append(page_path(output_file, output_path))
+                index.update(source_file, paths[-1], infos.get(source_file))
+            index.retain(paths)
+            index.commit()
+        listed = generate_listings(index, load_template(template_path, base_path), output_path, manifest, args.per_page,
+                                   args.sort, set(paths), options)
+        index.close()
+        print(f"{index.summary()}, {listed} listing pages")
+    if args.search:
+        search = SearchIndex(os.path.join(args.cache_dir, "search.json"), output_path, base_path, args.search_prefix)
+        with profiler.phase("search"):
+            page_keys = []
+            for source_file, output_file in work.pages:
+                page_keys.append(page_path(output_file, output_path))
+                search.update(source_file, page_keys[-1], infos.get(source_file))
+            search.retain(page_keys)
+            for output_file in search.write():
+                manifest.record(output_file, {"source": "search"})
+                if compressor:
+                    compressor.add(output_file)
+        search.save()
+        print(search.summary())
+    assets.finish()
+    if fingerprint:
+        for output_file in fingerprint.outputs():
+            manifest.record(output_file, {"source": output_file})
+        asset_manifest = os.path.join(output_path, "asset-manifest.json")
+        manifest.record(asset_manifest, {"source": asset_manifest})
+        fingerprint.write_manifest(asset_manifest, assets.urls)
+    broken = []
+    if args.check_links or args.strict_links:
+        checker = LinkChecker(os.path.join(args.cache_dir, "links.json"))
+        with profiler.phase("links"):
+            page_keys = []
+            for source_file, output_file in work.pages:
+                page_keys.append(page_path(output_file, output_path))
+                checker.update(source_file, page_keys[-1], infos.get(source_file))
+            checker.retain(page_keys)
+            broken = checker.check(manifest.outputs)
+        checker.save()
+        for source_file, line, kind, url in broken:
+            print(f"{source_file}:{line}: broken {kind} {url}")
+        print(checker.summary(broken))
+    failed = args.strict_links and broken
+    pruned = manifest.prune()
+    manifest.save()
+    print(assets.summary())
+    if dedup or fingerprint:
+        hash_index.save()
+    if dedup:
+        print(dedup.summary())
+    if cache:
+        print(cache.summary())
+    if compressor:
+        for key in manifest.outputs:
+            compressor.add(os.path.join(output_path, key))
+        compressor.finish()
+        print(compressor.summary())
+    else:
+        removed = remove_gzip(output_path, manifest.outputs)
+        if removed:
+            print(f"Removed {removed} .gz files left by an earlier --gzip build")
+    if pruned:
+        print(f"Pruned {pruned} stale outputs")
+    if args.atomic_publish and failed:
+        print(f"Not publishing {output_path} because of broken links")
+    elif args.atomic_publish:
+        publish_tree(output_path, public_path)
+        print(f"Published {output_path} to {public_path}")
+    if pipeline:
+        print(pipeline.summary())
+    if minifier:
+        print(minifier.summary())
+    if args.incremental:
+        print(f"Incremental build: {manifest.skipped} pages up to date, {rendered} rendered")
+    if profiler.enabled:
+        print(profiler.report(args.profile_top))
+    if args.trace:
+        profiler.write_trace(args.trace)
+        print(f"Wrote trace to {args.trace}")
+    return 1 if failed else 0
+
+
+def filtered_out(work, source_file):
+    for root in (content_path, static_path):
+        relative = os.path.relpath(source_file, root)
+        if not relative.startswith(os.pardir) and os.path.exists(source_file):
+            return not work.selects(relative.replace(os.sep, "/"))
+    return False
+
+
+def copy_files(source_path, dest_path, manifest=None, assets=None, work=None):
+    if work is None:
+        work = WorkList()
+        work.scan(source_path, dest_path, pages=False)
+        work.make_directories()
+    for source_file, dest_file in work.assets:
+        copy_asset(source_file, dest_file, manifest, assets)
+
+
+def copy_asset(source_file, dest_file, manifest=None, assets=None):
+    if manifest:
+        manifest.record(dest_file, manifest.asset_inputs(source_file))
+    if assets:
+        assets.add(source_file, dest_file)
+    else:
+        shutil.copy2(source_file, dest_file)
+
+
+def generate_page(src_path, template_path, dest_path, manifest=None, assets=None, work=None, options=DEFAULT_OPTIONS):
+    profiler = options.profiler
+    compressor = options.compressor
+    minifier = options.minifier
+    if work is None:
+        work = WorkList()
+        work.scan(src_path, dest_path)
+        work.make_directories()
+        copy_files(src_path, dest_path, manifest, assets, work)
+    url_map = {}
+    if assets and (assets.fingerprint or (assets.dedup and assets.dedup.rewrite_urls)):
+        url_map, shared_files = assets.url_map()
+        if manifest:
+            manifest.page_options["url_map"] = hash_data(url_map)
+            for shared_file in shared_files:
+                manifest.record(shared_file, {"source": shared_file})
+    with profiler.phase("discover"):
+        pages = collect_pages(src_path, dest_path, manifest, work)
+    template = load_template(template_path, base_path, url_map)
+    infos = {}
+    if options.pipeline:
+        def read(source_file):
+            with profiler.phase("read", source_file):
+                return read_page(source_file)
+
+        def render(source_file, output_file, data):
+            html, info = render_page_data(source_file, data, template, page_path(output_file, dest_path), options)
+            if html is not None:
+                infos[source_file] = info
+            return html
+
+        def write(source_file, output_file, html):
+            if html is None:
+                infos[source_file] = render_to_file(source_file, output_file, template, dest_path, options)
+                return
+            with profiler.phase("write", source_file):
+                write_page(output_file, html, minifier)
+            if compressor:
+                compressor.add(output_file)
+
+        options.pipeline.run(pages, read, render, write)
+    elif options.jobs > 1 and len(pages) > 1:
+        # Pages above stream_threshold are streamed into their file here
+        # rather than materialized in a worker and pickled back.
+        large, small = [], []
+        for page in pages:
+            (large if os.path.getsize(page[0]) > stream_threshold else small).append(page)
+        with ProcessPoolExecutor(max_workers=options.jobs, initializer=init_worker, initargs=(options.cache,)) as pool:
+            futures = {
+                pool.submit(render_page_html, source_file, template, page_path(output_file, dest_path), profiler.enabled,
+                            options.fields): (source_file, output_file)
+                for source_file, output_file in small
+            }
+            for source_file, output_file in large:
+                infos[source_file] = render_to_file(source_file, output_file, template, dest_path, options)
+            for future in as_completed(futures):
+                source_file, output_file = futures[future]
+                try:
+                    html, events, cache_counts, infos[source_file] = future.result()
+                except Exception as error:
+                    raise Exception(f"Failed to render {source_file}: {error}") from error
+                if events:
+                    profiler.events.extend(events)
+                if options.cache:
+                    options.cache.add_counts(cache_counts)
+                with profiler.phase("write", source_file):
+                    write_page(output_file, html, minifier)
+                if compressor:
+                    compressor.add(output_file)
     else:
-        os.makedirs(public_path, exist_ok=True)
-        copy_files(static_path, public_path)
-        generate_page(content_path, template_path, public_path)
+        for source_file, output_file in pages:
+            infos[source_file] = render_to_file(source_file, output_file, template, dest_path, options)
+    return len(pages), infos
+
 
+def render_to_file(source_file, output_file, template, dest_path, options=DEFAULT_OPTIONS):
+    os.makedirs(os.path.dirname(output_file), exist_ok=True)
+    with open_atomic(output_file) as file:
+        try:
+            stream = options.minifier.stream(file.write) if options.minifier else None
+            info = render_page(source_file, template, stream.write if stream else file.write,
+                               page_path(output_file, dest_path), options)
+            if stream:
+                stream.close()
+        except Exception as error:
+            raise Exception(f"Failed to render {source_file}: {error}") from error
+    if options.compressor:
+        options.compressor.add(output_file)
+    return info
 
-def copy_files(source_path, dest_path):
-    items = os.listdir(source_path)
-    for item in items:
-        source_item_path = os.path.join(source_path, item)
-        dest_item_path = os.path.join(dest_path, item)
 
-        if os.path.isfile(source_item_path):
-            shutil.copy2(source_item_path, dest_item_path)
-        else:
-            if not os.path.exists(dest_item_path):
-                os.makedirs(dest_item_path, exist_ok=True)
-            copy_files(source_item_path, dest_item_path)
+def generate_listings(index, template, dest_path, manifest=None, per_page=10, order="date", taken=(),
+                      options=DEFAULT_OPTIONS):
+    written = 0
+    for collection in index.collections():
+        page_count = max(1, -(-index.count(collection) // per_page))
+        first_path = f"{collection}/index.html"
+        if first_path in taken:
+            first_path = f"{collection}/page/1/index.html"
+        for page in range(1, page_count + 1):
+            entries = index.pages(collection, order, per_page, (page - 1) * per_page)
+            title, content = listing_html(collection, entries, page, page_count, first_path)
+            newest = max(entry["mtime_ns"] for entry in entries)
+            key = first_path if page == 1 else f"{collection}/page/{page}/index.html"
+            output_file = os.path.join(dest_path, key)
+            html = template.render(
+                Title=template.rewrite_urls(title),
+                Content=template.rewrite_urls(content),
+                date=datetime.date.fromtimestamp(newest / 1e9).isoformat(),
+                path=key,
+            )
+            write_page(output_file, html, options.minifier)
+            if manifest:
+                manifest.record(output_file, {"source": f"collection:{collection}", "page": page})
+            if options.compressor:
+                options.compressor.add(output_file)
+            written += 1
+    return written
 
 
-def generate_page(src_path, template_path, dest_path):
+def collect_pages(src_path, dest_path, manifest, work):
     print(f"Generating page from {src_path} to {dest_path} using {template_path}")
-    items = os.listdir(src_path)
-    for item in items:
-        source_item_path = os.path.join(src_path, item)
-        if os.path.isfile(source_item_path):
-            filename, ext = os.path.splitext(item)
-            if ext.lower() in ['.md', '.markdown']:
-                with open(source_item_path, 'r', encoding='utf-8') as file:
-                    markdown_content = file.read()
-                with open(template_path, 'r', encoding='utf-8') as file:
-                    template_content = file.read()
-
-                title = extract_title(markdown_content)
-                body = markdown_to_html_node(markdown_content)
-                template_content = template_content.replace("{{ Title }}", title)
-                template_content = template_content.replace("{{ Content }}", body)
-                template_content = template_content.replace('href=/', f'href={base_path}')
-                template_content = template_content.replace('src=/', f'src={base_path}')
-
-                output_file = os.path.join(dest_path, f"{filename}.html")
-                os.makedirs(dest_path, exist_ok=True)
-                with open(output_file, 'w', encoding='utf-8') as file:
-                    file.write(template_content)
-            else:
-                os.makedirs(dest_path, exist_ok=True)
-                shutil.copy2(source_item_path, os.path.join(dest_path, item))
-        else:
-            new_dest_path = os.path.join(dest_path, item)
-            os.makedirs(new_dest_path, exist_ok=True)
-            generate_page(source_item_path, template_path, new_dest_path)
+    pages = []
+    for source_file, output_file in work.pages:
+        if manifest:
+            inputs = manifest.page_inputs(source_file)
+            manifest.record(output_file, inputs)
+            if manifest.is_fresh(output_file, inputs):
+                manifest.skipped += 1
+                continue
+        pages.append((source_file, output_file))
+    return pages
+
+
+def page_path(output_file, root_path):
+    return os.path.relpath(output_file, root_path).replace(os.sep, "/")
+
+
+def render_page(source_file, template, write, path="", options=DEFAULT_OPTIONS):
+    if options.profiler.enabled:
+        return render_page_profiled(source_file, template, write, path, options)
+    stat = os.stat(source_file)
+    modified = datetime.date.fromtimestamp(stat.st_mtime).isoformat()
+    if stat.st_size > stream_threshold:
+        return render_page_streaming(source_file, template, write, path, modified, options.fields)
+    with open(source_file, 'r', encoding='utf-8') as file:
+        document = parse_document(file, options.cache)
+    return render_document(document, template, write, path, modified, options.fields)
+
+
+def render_document(document, template, write, path, modified, fields=()):
+    title = document.title
+    template.write(
+        write,
+        Title=template.rewrite_urls(title),
+        Content=lambda out: document.write_html(template.url_writer(out)),
+        date=modified,
+        path=path,
+    )
+    if fields:
+        return document_info(document, fields, title)
+    return None
+
+
+def read_page(source_file):
+    stat = os.stat(source_file)
+    modified = datetime.date.fromtimestamp(stat.st_mtime).isoformat()
+    if stat.st_size > stream_threshold:
+        return None, modified
+    with open(source_file, 'r', encoding='utf-8') as file:
+        return file.readlines(), modified
+
+
+def render_page_data(source_file, data, template, path="", options=DEFAULT_OPTIONS):
+    lines, modified = data
+    if lines is None:
+        return None, None
+    chunks = []
+    with options.profiler.phase("render", source_file):
+        info = render_document(parse_document(lines, options.cache), template, chunks.append, path, modified,
+                               options.fields)
+    return "".join(chunks), info
+
+
+def render_page_streaming(source_file, template, write, path, modified, fields=()):
+    # Very large sources are read twice, once for the title and once for
+    # the body, so memory stays bounded by the largest block.
+    with open(source_file, 'r', encoding='utf-8') as file:
+        title = title_from_typed_blocks(iter_typed_blocks(file))
+    info = PageInfo(fields, title)
+
+    def collect(file):
+        for number, block, block_type in iter_numbered_blocks(file):
+            info.add(number, block, block_type)
+            yield block, block_type
+
+    def content(out):
+        with open(source_file, 'r', encoding='utf-8') as file:
+            write_typed_blocks_html(collect(file) if fields else iter_typed_blocks(file), template.url_writer(out))
+
+    template.write(write, Title=template.rewrite_urls(title), Content=content, date=modified, path=path)
+    if fields:
+        return info.result()
+    return None
+
+
+def render_page_profiled(source_file, template, write, path, options):
+    profiler = options.profiler
+    # Streaming interleaves serialization, substitution and writing, so
+    # profiled builds materialize each step to time them separately.
+    with profiler.phase("read", source_file):
+        with open(source_file, 'r', encoding='utf-8') as file:
+            markdown_content = file.read()
+        modified = datetime.date.fromtimestamp(os.path.getmtime(source_file))
+
+    with profiler.phase("blocks", source_file):
+        document = parse_document(markdown_content, options.cache)
+    with profiler.phase("inline", source_file):
+        if options.cache is None:
+            document.nodes
+    with profiler.phase("title", source_file):
+        title = document.title
+    with profiler.phase("serialize", source_file):
+        chunks = []
+        document.write_html(template.url_writer(chunks.append))
+    with profiler.phase("template", source_file):
+        html = template.render(Title=template.rewrite_urls(title), Content="".join(chunks), date=modified.isoformat(),
+                               path=path)
+    if options.buffered:
+        write(html)
+    else:
+        with profiler.phase("write", source_file):
+            write(html)
+    if options.fields:
+        with profiler.phase("info", source_file):
+            return document_info(document, options.fields, title)
+    return None
+
+
+worker_cache = None
+
+
+def init_worker(cache):
+    global worker_cache
+    worker_cache = cache
+
+
+def render_page_html(source_file, template, path="", profile=False, fields=()):
+    profiler = BuildProfiler() if profile else NULL_PROFILER
+    before = worker_cache.counts() if worker_cache else None
+    chunks = []
+    # The parent times the real file write, so the worker's copy into a
+    # list is left out of the "write" phase.
+    options = BuildOptions(profiler=profiler, cache=worker_cache, fields=fields, buffered=True)
+    info = render_page(source_file, template, chunks.append, path, options)
+    cache_counts = None
+    if worker_cache:
+        cache_counts = tuple(after - start for after, start in zip(worker_cache.counts(), before))
+    return "".join(chunks), list(profiler.events), cache_counts, info
+
+
+def write_page(output_file, html, minifier=None):
+    if minifier:
+        html = minifier.minify(html)
+    os.makedirs(os.path.dirname(output_file), exist_ok=True)
+    with open_atomic(output_file) as file:
+        file.write(html)
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    sys.exit(main())
\ No newline at end of file
@@ -0,0 +1,160 @@
+import contextlib
+import hashlib
+import json
+import os
+import shutil
+import threading
+import time
+
+MANIFEST_FILE = ".manifest.json"
+MANIFEST_VERSION = 1
+
+
+def hash_file(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as file:
+        for chunk in iter(lambda: file.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def hash_data(data):
+    return hashlib.sha256(json.dumps(data, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def temp_path(path):
+    return f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+
+
+@contextlib.contextmanager
+def open_atomic(path, mode="w"):
+    temp_file = temp_path(path)
+    try:
+        if "b" in mode:
+            file = open(temp_file, mode)
+        else:
+            file = open(temp_file, mode, encoding="utf-8")
+        with file:
+            yield file
+        os.replace(temp_file, path)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.remove(temp_file)
+        raise
+
+
+def clone_tree(source_path, dest_path):
+    if os.path.exists(dest_path):
+        shutil.rmtree(dest_path)
+    if os.path.exists(source_path):
+        shutil.copytree(source_path, dest_path, symlinks=True, copy_function=os.link)
+    else:
+        os.makedirs(dest_path)
+
+
+def publish_tree(staging_path, public_path):
+    if os.path.islink(public_path):
+        target = f"{public_path}.{os.getpid()}.{int(time.time())}"
+        os.rename(staging_path, target)
+        previous = os.path.realpath(public_path)
+        link = temp_path(public_path)
+        os.symlink(os.path.basename(target), link)
+        os.replace(link, public_path)
+        shutil.rmtree(previous, ignore_errors=True)
+        return
+    retired = f"{public_path}.old"
+    if os.path.exists(retired):
+        shutil.rmtree(retired)
+    if os.path.exists(public_path):
+        os.rename(public_path, retired)
+    os.rename(staging_path, public_path)
+    shutil.rmtree(retired, ignore_errors=True)
+
+
+def load_manifest_data(output_path):
+    path = os.path.join(output_path, MANIFEST_FILE)
+    try:
+        with open(path, "r", encoding="utf-8") as file:
+            data = json.load(file)
+    except (OSError, ValueError):
+        return {}
+    if data.get("version") != MANIFEST_VERSION:
+        return {}
+    return data
+
+
+def load_manifest(output_path):
+    return load_manifest_data(output_path).get("outputs", {})
+
+
+class BuildManifest():
+    def __init__(self, output_path, template_path, base_path, incremental=False):
+        self.output_path = output_path
+        self.template_hash = hash_file(template_path)
+        self.base_path = base_path
+        self.incremental = incremental
+        self.previous = load_manifest(output_path)
+        self.outputs = {}
+        self.meta = {}
+        self.page_options = {}
+        self.skipped = 0
+
+    def key(self, output_file):
+        return os.path.relpath(output_file, self.output_path).replace(os.sep, "/")
+
+    def page_inputs(self, source_file):
+        return {
+            "source": source_file,
+            "source_hash": hash_file(source_file),
+            "template_hash": self.template_hash,
+            "base_path": self.base_path,
+            **self.page_options,
+        }
+
+    def asset_inputs(self, source_file):
+        return {"source": source_file}
+
+    def is_fresh(self, output_file, inputs):
+        if not self.incremental:
+            return False
+        if self.previous.get(self.key(output_file)) != inputs:
+            return False
+        return os.path.exists(output_file)
+
+    def record(self, output_file, inputs):
+        self.outputs[self.key(output_file)] = inputs
+
+    def carry_over(self, keep):
+        carried = 0
+        for key, inputs in self.previous.items():
+            if key not in self.outputs and keep(inputs):
+                self.outputs[key] = inputs
+                carried += 1
+        return carried
+
+    def prune(self):
+        removed = 0
+        for key in self.previous:
+            if key in self.outputs:
+                continue
+            path = os.path.join(self.output_path, key)
+            for stale in (path, f"{path}.gz"):
+                if os.path.isfile(stale) or os.path.islink(stale):
+                    os.remove(stale)
+                    removed += 1
+            directory = os.path.dirname(path)
+            while os.path.abspath(directory) != os.path.abspath(self.output_path):
+                try:
+                    os.rmdir(directory)
+                except OSError:
+                    break
+                directory = os.path.dirname(directory)
+        return removed
+
+    def save(self):
+        path = os.path.join(self.output_path, MANIFEST_FILE)
+        with open_atomic(path) as file:
+            data = {"version": MANIFEST_VERSION, "outputs": self.outputs}
+            if self.meta:
+                data["meta"] = self.meta
+            json.dump(data, file, indent=1, sort_keys=True)
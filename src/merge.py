@@ -0,0 +1,109 @@
+import argparse
+import glob
+import os
+
+import main as build
+from discover import WorkList
+from manifest import BuildManifest, hash_file, load_manifest_data
+from sync import replace_with_copy, replace_with_link
+
+
+def load_shards(shard_paths):
+    shards = []
+    for path in shard_paths:
+        data = load_manifest_data(path)
+        meta = data.get("meta", {})
+        if "shard" not in meta:
+            raise Exception(f"{path} has no shard manifest, build it with --shard i/N")
+        shards.append((path, data["outputs"], meta))
+    return shards
+
+
+def expected_outputs(meta):
+    work = WorkList(meta.get("include", []), meta.get("exclude", []))
+    work.scan(build.static_path, "", pages=False)
+    work.scan(build.content_path, "")
+    return {output_file.replace(os.sep, "/") for _, output_file in work.pages + work.assets}
+
+
+def plan_merge(shards):
+    conflicts = []
+    missing = []
+    count = shards[0][2]["shard"][1]
+    seen = {}
+    for path, _, meta in shards:
+        index, shard_count = meta["shard"]
+        if shard_count != count:
+            conflicts.append(f"{path} is shard {index}/{shard_count} but other shards use N={count}")
+        elif index in seen:
+            conflicts.append(f"{path} and {seen[index]} are both shard {index}/{count}")
+        seen[index] = path
+        for field in ("base_path", "template_hash", "include", "exclude"):
+            if meta.get(field) != shards[0][2].get(field):
+                conflicts.append(f"{path} was built with a different {field} than {shards[0][0]}")
+    missing.extend(f"shard {index}/{count}" for index in range(count) if index not in seen)
+
+    owners = {}
+    for path, outputs, _ in shards:
+        for key, inputs in outputs.items():
+            source = os.path.join(path, key)
+            if not os.path.exists(source):
+                missing.append(f"{key} (listed by {path})")
+                continue
+            if key in owners:
+                other = os.path.join(owners[key][0], key)
+                if hash_file(source) != hash_file(other):
+                    conflicts.append(f"{key} differs between {owners[key][0]} and {path}")
+                continue
+            owners[key] = (path, inputs)
+    if os.path.isdir(build.content_path) and os.path.isdir(build.static_path):
+        for key in sorted(expected_outputs(shards[0][2]) - owners.keys()):
+            missing.append(f"{key} (not produced by any shard)")
+    return owners, conflicts, missing
+
+
+def merge_shards(shard_paths, output_path):
+    shards = load_shards(shard_paths)
+    if not shards:
+        raise Exception("No shard outputs to merge")
+    owners, conflicts, missing = plan_merge(shards)
+    if conflicts or missing:
+        return 0, conflicts, missing
+    meta = shards[0][2]
+    os.makedirs(output_path, exist_ok=True)
+    manifest = BuildManifest(output_path, build.template_path, meta.get("base_path", ""))
+    for key, (path, inputs) in sorted(owners.items()):
+        dest_file = os.path.join(output_path, key)
+        os.makedirs(os.path.dirname(dest_file), exist_ok=True)
+        for suffix in ("", ".gz"):
+            source_file = os.path.join(path, key) + suffix
+            if suffix and not os.path.exists(source_file):
+                continue
+            if os.path.exists(dest_file + suffix) and os.path.samefile(source_file, dest_file + suffix):
+                continue
+            if not replace_with_link(source_file, dest_file + suffix):
+                replace_with_copy(source_file, dest_file + suffix)
+        manifest.record(dest_file, inputs)
+    manifest.prune()
+    manifest.save()
+    return len(owners), conflicts, missing
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="main.py merge")
+    parser.add_argument("shards", nargs="*",
+                        help=f"shard output directories, defaults to {build.public_path}.shard-*")
+    parser.add_argument("--output", default=build.public_path)
+    args = parser.parse_args(argv)
+    shard_paths = args.shards or sorted(glob.glob(f"{glob.escape(args.output)}.shard-*"))
+
+    merged, conflicts, missing = merge_shards(shard_paths, args.output)
+    for conflict in conflicts:
+        print(f"Conflict: {conflict}")
+    for output in missing:
+        print(f"Missing: {output}")
+    if conflicts or missing:
+        print(f"Merge aborted: {len(conflicts)} conflicts, {len(missing)} missing outputs")
+        return 1
+    print(f"Merged {len(shard_paths)} shards into {args.output}: {merged} outputs")
+    return 0
@@ -0,0 +1,118 @@
+import datetime
+import json
+import os
+import sqlite3
+
+from pageinfo import read_page_info
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS pages (
+    path TEXT PRIMARY KEY,
+    source TEXT NOT NULL,
+    collection TEXT NOT NULL,
+    title TEXT NOT NULL,
+    headings TEXT NOT NULL,
+    words INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS pages_by_date ON pages (collection, mtime_ns DESC, path);
+CREATE INDEX IF NOT EXISTS pages_by_title ON pages (collection, title, path);
+"""
+
+ORDERS = {
+    "date": "mtime_ns DESC, path",
+    "title": "title, path",
+}
+
+
+def collection_of(path):
+    directory = os.path.dirname(path)
+    if os.path.basename(path) == "index.html":
+        directory = os.path.dirname(directory)
+    return directory
+
+
+def page_url(path):
+    if os.path.basename(path) == "index.html":
+        return "/" + os.path.dirname(path)
+    return "/" + path
+
+
+class MetadataIndex():
+    def __init__(self, db_path):
+        os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+        self.connection = sqlite3.connect(db_path)
+        self.connection.executescript(SCHEMA)
+        self.updated = 0
+        self.unchanged = 0
+
+    def update(self, source_file, path, info=None):
+        stat = os.stat(source_file)
+        row = self.connection.execute("SELECT mtime_ns, size FROM pages WHERE path = ?", (path,)).fetchone()
+        if row == (stat.st_mtime_ns, stat.st_size):
+            self.unchanged += 1
+            return
+        if info is None:
+            info = read_page_info(source_file, ("collections",))
+        self.connection.execute(
+            "INSERT OR REPLACE INTO pages VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (path, source_file, collection_of(path), info["title"], json.dumps(info["headings"]),
+             info["words"], stat.st_mtime_ns, stat.st_size),
+        )
+        self.updated += 1
+
+    def retain(self, paths):
+        known = {path for (path,) in self.connection.execute("SELECT path FROM pages")}
+        self.connection.executemany("DELETE FROM pages WHERE path = ?", [(path,) for path in known - set(paths)])
+
+    def collections(self):
+        rows = self.connection.execute("SELECT DISTINCT collection FROM pages WHERE collection != '' ORDER BY collection")
+        return [collection for (collection,) in rows]
+
+    def count(self, collection):
+        return self.connection.execute("SELECT COUNT(*) FROM pages WHERE collection = ?", (collection,)).fetchone()[0]
+
+    def pages(self, collection, order="date", limit=-1, offset=0):
+        rows = self.connection.execute(
+            f"SELECT path, title, headings, words, mtime_ns FROM pages WHERE collection = ? "
+            f"ORDER BY {ORDERS[order]} LIMIT ? OFFSET ?",
+            (collection, limit, offset),
+        )
+        return [
+            {"path": path, "title": title, "headings": json.loads(headings), "words": words, "mtime_ns": mtime_ns}
+            for path, title, headings, words, mtime_ns in rows
+        ]
+
+    def commit(self):
+        self.connection.commit()
+
+    def close(self):
+        self.connection.commit()
+        self.connection.close()
+
+    def summary(self):
+        return f"Page index: {self.updated} updated, {self.unchanged} unchanged"
+
+
+def listing_url(collection, page, first_path):
+    if page == 1:
+        return page_url(first_path)
+    return f"/{collection}/page/{page}"
+
+
+def listing_html(collection, entries, page, page_count, first_path):
+    heading = os.path.basename(collection).replace("-", " ").title()
+    if page > 1:
+        heading = f"{heading} (page {page})"
+    items = []
+    for entry in entries:
+        date = datetime.date.fromtimestamp(entry["mtime_ns"] / 1e9).isoformat()
+        items.append(f"<li><a href={page_url(entry['path'])}>{entry['title']}</a> <time>{date}</time></li>")
+    links = []
+    if page > 1:
+        links.append(f"<a href={listing_url(collection, page - 1, first_path)}>Previous</a>")
+    if page < page_count:
+        links.append(f"<a href={listing_url(collection, page + 1, first_path)}>Next</a>")
+    navigation = f"<nav>{' '.join(links)}</nav>" if links else ""
+    return heading, f"<div><h1>{heading}</h1><ul>{''.join(items)}</ul>{navigation}</div>"
@@ -0,0 +1,141 @@
+import re
+import threading
+import time
+
+TOKEN_PATTERN = re.compile(r"<!--.*?-->|<[^>]*>|[^<]+|<", re.DOTALL)
+TAG_NAME_PATTERN = re.compile(r"<\s*(/?)\s*([a-zA-Z][\w-]*)")
+WHITESPACE_PATTERN = re.compile(r"\s+")
+RAW_TAGS = {"pre", "code", "textarea", "script", "style"}
+RAW_END_PATTERNS = {tag: re.compile(f"</{tag}", re.IGNORECASE) for tag in RAW_TAGS}
+BLOCK_TAGS = {
+    "html", "head", "body", "title", "meta", "link", "script", "style", "base",
+    "article", "section", "nav", "header", "footer", "main", "aside", "div", "p",
+    "ul", "ol", "li", "dl", "dt", "dd", "blockquote", "pre", "hr", "br", "figure",
+    "table", "thead", "tbody", "tr", "th", "td", "form",
+    "h1", "h2", "h3", "h4", "h5", "h6",
+}
+
+
+def tag_name(tag):
+    match = TAG_NAME_PATTERN.match(tag)
+    if match:
+        return match.group(1), match.group(2).lower()
+    if tag.startswith("<!"):
+        return "", "!"
+    return "", None
+
+
+class MinifyStream():
+    def __init__(self, write, minifier):
+        self.downstream = write
+        self.minifier = minifier
+        self.carry = ""
+        self.raw = None
+        self.pending_space = False
+        self.after_block = True
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.elapsed = 0
+
+    def write(self, chunk):
+        start = time.perf_counter()
+        self.bytes_in += len(chunk.encode("utf-8"))
+        out = []
+        self.feed(self.carry + chunk, out, final=False)
+        self.flush(out, start)
+
+    def close(self):
+        start = time.perf_counter()
+        out = []
+        self.feed(self.carry, out, final=True)
+        self.carry = ""
+        self.flush(out, start)
+        self.minifier.add(self.bytes_in, self.bytes_out, self.elapsed)
+
+    def flush(self, out, start):
+        text = "".join(out)
+        self.bytes_out += len(text.encode("utf-8"))
+        self.elapsed += time.perf_counter() - start
+        if text:
+            self.downstream(text)
+
+    def feed(self, text, out, final):
+        self.carry = ""
+        position = 0
+        while position < len(text):
+            if self.raw:
+                match = RAW_END_PATTERNS[self.raw].search(text, position)
+                if match is None:
+                    keep = 0 if final else min(len(text) - position, len(self.raw) + 1)
+                    out.append(text[position:len(text) - keep])
+                    self.carry = text[len(text) - keep:]
+                    return
+                out.append(text[position:match.start()])
+                self.raw = None
+                position = match.start()
+                continue
+            match = TOKEN_PATTERN.match(text, position)
+            token = match.group(0)
+            if token == "<" or (token.startswith("<!--") and not token.endswith("-->")):
+                if not final:
+                    self.carry = text[position:]
+                    return
+            if token.startswith("<"):
+                if token.startswith("<!--") and token.endswith("-->") and not token.startswith("<!--[if"):
+                    position = match.end()
+                    continue
+                closing, name = tag_name(token)
+                if self.pending_space and not (self.after_block or name in BLOCK_TAGS or name == "!"):
+                    out.append(" ")
+                self.pending_space = False
+                out.append(token)
+                self.after_block = name in BLOCK_TAGS or name == "!"
+                if name in RAW_TAGS and not closing and not token.endswith("/>"):
+                    self.raw = name
+                    self.after_block = False
+            else:
+                collapsed = WHITESPACE_PATTERN.sub(" ", token)
+                if collapsed == " ":
+                    self.pending_space = True
+                else:
+                    if collapsed.startswith(" "):
+                        collapsed = collapsed[1:]
+                        self.pending_space = True
+                    if self.pending_space and not self.after_block:
+                        out.append(" ")
+                    self.pending_space = collapsed.endswith(" ")
+                    out.append(collapsed.rstrip(" "))
+                    self.after_block = False
+            position = match.end()
+
+
+class Minifier():
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.pages = 0
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.elapsed = 0
+
+    def stream(self, write):
+        return MinifyStream(write, self)
+
+    def minify(self, html):
+        chunks = []
+        stream = self.stream(chunks.append)
+        stream.write(html)
+        stream.close()
+        return "".join(chunks)
+
+    def add(self, bytes_in, bytes_out, elapsed):
+        with self.lock:
+            self.pages += 1
+            self.bytes_in += bytes_in
+            self.bytes_out += bytes_out
+            self.elapsed += elapsed
+
+    def summary(self):
+        saved = self.bytes_in - self.bytes_out
+        percent = saved / self.bytes_in * 100 if self.bytes_in else 0
+        return (f"Minify: {self.pages} pages, {self.bytes_in} -> {self.bytes_out} bytes "
+                f"({saved} saved, {percent:.1f}%) in {self.elapsed:.4f}s")
@@ -0,0 +1,75 @@
+import re
+
+from document import heading_of, parse_document
+from utils import INLINE_PATTERN, BlockType
+
+TERM_PATTERN = re.compile(r"[^\W_]+")
+LINK_TARGET_PATTERN = re.compile(r"\]\s*\([^()]*\)")
+
+
+def count_words(text):
+    return sum(1 for word in text.split() if any(char.isalnum() for char in word))
+
+
+def iter_targets(text):
+    for match in INLINE_PATTERN.finditer(text):
+        kind = match.lastgroup
+        if kind == "src":
+            yield "image", match.group("src")
+        elif kind == "href":
+            yield "link", match.group("href")
+        elif kind in ("bold", "italic"):
+            yield from iter_targets(match.group(kind))
+
+
+class PageInfo():
+    def __init__(self, fields, title=None):
+        self.fields = fields
+        self.title = title
+        self.headings = []
+        self.words = 0
+        self.terms = set()
+        self.references = []
+
+    def add(self, number, block, block_type):
+        if "collections" in self.fields:
+            self.words += count_words(block)
+            if block_type == BlockType.HEADING:
+                self.headings.append(heading_of(block))
+        if block_type == BlockType.CODE:
+            return
+        if "search" in self.fields:
+            text = LINK_TARGET_PATTERN.sub("]", block).lower()
+            self.terms.update(term for term in TERM_PATTERN.findall(text) if len(term) > 1)
+        if "links" in self.fields:
+            for offset, line in enumerate(block.split("\n")):
+                for kind, url in iter_targets(line):
+                    self.references.append([number + offset, kind, url.strip()])
+
+    def result(self):
+        info = {"title": self.title}
+        if "collections" in self.fields:
+            info["headings"] = self.headings
+            info["words"] = self.words
+        if "search" in self.fields:
+            info["terms"] = sorted(self.terms)
+        if "links" in self.fields:
+            info["references"] = self.references
+        return info
+
+
+def document_info(document, fields, title=None):
+    info = PageInfo(fields, title)
+    for number, (block, block_type) in zip(document.line_numbers, document.blocks):
+        info.add(number, block, block_type)
+    return info.result()
+
+
+def read_page_info(source_file, fields):
+    with open(source_file, "r", encoding="utf-8") as file:
+        document = parse_document(file)
+    try:
+        title = document.title
+    except Exception:
+        title = None
+    return document_info(document, fields, title)
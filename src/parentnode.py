@@ -1,16 +1,26 @@
 from htmlnode import HTMLNode
 
 class ParentNode(HTMLNode):
+    __slots__ = ()
+
     def __init__(self, tag, children):
-        super().__init__(tag, None, children, None)
+        self.tag = tag
+        self.value = None
+        self.children = children
+        self.props = None
 
     def to_html(self):
+        chunks = []
+        self.write_html(chunks.append)
+        return "".join(chunks)
+
+    def write_html(self, write):
         if self.tag == None:
             raise ValueError("All parents must have a tag")
         elif self.children == None:
             raise ValueError("All parents must have a children")
-        
-        children = ""
+
+        write(f"<{self.tag}>")
         for child in self.children:
-            children += child.to_html()
-        return f"<{self.tag}>{children}</{self.tag}>"
\ No newline at end of file
+            child.write_html(write)
+        write(f"</{self.tag}>")
\ No newline at end of file
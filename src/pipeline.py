@@ -0,0 +1,77 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+
+class PagePipeline():
+    def __init__(self, read_ahead=16, write_behind=16, io_jobs=None):
+        self.read_ahead = read_ahead
+        self.write_behind = write_behind
+        self.io_jobs = io_jobs
+        self.pages = 0
+        self.written = []
+        self.read_wait = 0
+        self.write_wait = 0
+
+    def run(self, pages, read, render, write):
+        asyncio.run(self.build(pages, read, render, write))
+
+    async def build(self, pages, read, render, write):
+        reads = asyncio.Queue(self.read_ahead)
+        writes = asyncio.Queue(self.write_behind)
+        with ThreadPoolExecutor(max_workers=self.io_jobs) as io:
+            tasks = [
+                asyncio.create_task(self.read_stage(pages, read, reads, io)),
+                asyncio.create_task(self.render_stage(render, reads, writes, write, io)),
+                asyncio.create_task(self.write_stage(writes)),
+            ]
+            try:
+                await asyncio.gather(*tasks)
+            except BaseException:
+                for task in tasks:
+                    task.cancel()
+                raise
+
+    async def read_stage(self, pages, read, reads, io):
+        loop = asyncio.get_running_loop()
+        for source_file, output_file in pages:
+            future = loop.run_in_executor(io, read, source_file)
+            await reads.put((source_file, output_file, future))
+        await reads.put(None)
+
+    async def render_stage(self, render, reads, writes, write, io):
+        loop = asyncio.get_running_loop()
+        while True:
+            start = time.perf_counter()
+            item = await reads.get()
+            if item is None:
+                break
+            source_file, output_file, future = item
+            try:
+                data = await future
+                self.read_wait += time.perf_counter() - start
+                result = render(source_file, output_file, data)
+            except Exception as error:
+                raise Exception(f"Failed to render {source_file}: {error}") from error
+            start = time.perf_counter()
+            await writes.put((output_file, loop.run_in_executor(io, write, source_file, output_file, result)))
+            self.write_wait += time.perf_counter() - start
+        await writes.put(None)
+
+    async def write_stage(self, writes):
+        while True:
+            item = await writes.get()
+            if item is None:
+                break
+            output_file, future = item
+            try:
+                await future
+            except OSError as error:
+                raise Exception(f"Failed to write {output_file}: {error}") from error
+            self.written.append(output_file)
+            self.pages += 1
+
+    def summary(self):
+        return (f"Pipeline: {self.pages} pages, renderer waited {self.read_wait:.4f}s on reads "
+                f"(read-ahead {self.read_ahead}) and {self.write_wait:.4f}s on writes "
+                f"(write-behind {self.write_behind})")
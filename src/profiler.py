@@ -0,0 +1,75 @@
+import contextlib
+import json
+import os
+import threading
+import time
+
+
+class NullProfiler():
+    enabled = False
+    events = ()
+
+    def phase(self, name, page=None):
+        return NULL_PHASE
+
+
+NULL_PHASE = contextlib.nullcontext()
+NULL_PROFILER = NullProfiler()
+
+
+class BuildProfiler():
+    enabled = True
+
+    def __init__(self):
+        self.origin = time.perf_counter()
+        self.events = []
+
+    @contextlib.contextmanager
+    def phase(self, name, page=None):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.events.append((name, page, start, time.perf_counter() - start, os.getpid(), threading.get_ident()))
+
+    def phase_totals(self):
+        totals = {}
+        for name, _, _, duration, _, _ in self.events:
+            totals[name] = totals.get(name, 0) + duration
+        return totals
+
+    def page_totals(self):
+        totals = {}
+        for _, page, _, duration, _, _ in self.events:
+            if page:
+                totals[page] = totals.get(page, 0) + duration
+        return totals
+
+    def report(self, slowest=10):
+        lines = [f"Build profile: {time.perf_counter() - self.origin:.4f}s wall time, phases summed across workers:"]
+        for name, total in sorted(self.phase_totals().items(), key=lambda item: -item[1]):
+            lines.append(f"  {name:<12}{total:10.4f}")
+        pages = sorted(self.page_totals().items(), key=lambda item: -item[1])[:slowest]
+        if pages:
+            lines.append(f"Slowest {len(pages)} files:")
+            for page, total in pages:
+                lines.append(f"  {total:10.4f}  {page}")
+        return "\n".join(lines)
+
+    def write_trace(self, path):
+        events = []
+        for name, page, start, duration, pid, tid in self.events:
+            event = {
+                "name": name,
+                "cat": "build",
+                "ph": "X",
+                "ts": (start - self.origin) * 1e6,
+                "dur": duration * 1e6,
+                "pid": pid,
+                "tid": tid,
+            }
+            if page:
+                event["args"] = {"file": page}
+            events.append(event)
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, file)
@@ -0,0 +1,152 @@
+import json
+import os
+
+from manifest import open_atomic
+from metadata import page_url
+from pageinfo import read_page_info
+
+STATE_VERSION = 2
+
+SEARCH_SCRIPT = """(function () {
+  const root = new URL(".", document.currentScript.src);
+  const cache = {};
+  const load = (name) =>
+    cache[name] || (cache[name] = fetch(new URL(name, root)).then((response) => (response.ok ? response.json() : {})));
+
+  window.siteSearch = async function (query) {
+    const index = await load("index.json");
+    const terms = (query.toLowerCase().match(/[\\p{L}\\p{N}]+/gu) || []).filter((term) => term.length > 1);
+    let matches = null;
+    for (const term of terms) {
+      const prefixes = term.length >= index.prefix_length
+        ? [term.slice(0, index.prefix_length)].filter((prefix) => index.shards.includes(prefix))
+        : index.shards.filter((prefix) => prefix.startsWith(term));
+      const ids = new Set();
+      for (const prefix of prefixes) {
+        const shard = await load("shards/" + encodeURIComponent(prefix) + ".json");
+        for (const [word, deltas] of Object.entries(shard)) {
+          if (!word.startsWith(term)) continue;
+          let id = 0;
+          for (const delta of deltas) ids.add((id += delta));
+        }
+      }
+      matches = matches === null ? ids : new Set([...matches].filter((id) => ids.has(id)));
+    }
+    const docs = await load("docs.json");
+    return [...(matches || [])].sort((a, b) => a - b).map((id) => ({ url: docs[id][0], title: docs[id][1] }));
+  };
+})();
+"""
+
+
+def delta_encode(ids):
+    previous = 0
+    deltas = []
+    for doc_id in ids:
+        deltas.append(doc_id - previous)
+        previous = doc_id
+    return deltas
+
+
+class SearchIndex():
+    def __init__(self, state_path, output_path, base_path="", prefix_length=2):
+        self.state_path = state_path
+        self.output_path = output_path
+        self.base_path = base_path
+        self.prefix_length = prefix_length
+        self.docs = {}
+        self.next_id = 0
+        try:
+            with open(state_path, "r", encoding="utf-8") as file:
+                state = json.load(file)
+            if (state["version"] == STATE_VERSION and state["prefix_length"] == prefix_length
+                    and state["base_path"] == base_path):
+                self.docs = state["docs"]
+                self.next_id = state["next_id"]
+        except (OSError, ValueError, KeyError):
+            pass
+        self.dirty = set()
+        self.rebuild = not self.docs or not os.path.exists(os.path.join(output_path, "search", "index.json"))
+        self.updated = 0
+        self.bytes_written = 0
+        self.shards_written = 0
+
+    def prefix(self, term):
+        return term[:self.prefix_length]
+
+    def update(self, source_file, page_key, info=None):
+        stat = os.stat(source_file)
+        stamp = [stat.st_mtime_ns, stat.st_size]
+        entry = self.docs.get(page_key)
+        if entry and entry["stamp"] == stamp:
+            return
+        if info is None:
+            info = read_page_info(source_file, ("search",))
+        title, terms = info["title"], info["terms"]
+        url = page_url(page_key)
+        if self.base_path:
+            url = self.base_path + url[1:]
+        if entry:
+            self.dirty.update(self.prefix(term) for term in set(entry["terms"]).symmetric_difference(terms))
+            doc_id = entry["id"]
+        else:
+            self.dirty.update(self.prefix(term) for term in terms)
+            doc_id = self.next_id
+            self.next_id += 1
+        self.docs[page_key] = {"id": doc_id, "stamp": stamp, "url": url, "title": title or url, "terms": terms}
+        self.updated += 1
+
+    def retain(self, page_keys):
+        page_keys = set(page_keys)
+        for page_key in list(self.docs):
+            if page_key not in page_keys:
+                self.dirty.update(self.prefix(term) for term in self.docs.pop(page_key)["terms"])
+                self.updated += 1
+
+    def shard_file(self, prefix):
+        return os.path.join(self.output_path, "search", "shards", f"{prefix}.json")
+
+    def write_json(self, path, data):
+        payload = json.dumps(data, separators=(",", ":"), ensure_ascii=False, sort_keys=True)
+        with open_atomic(path) as file:
+            file.write(payload)
+        self.bytes_written += len(payload.encode("utf-8"))
+
+    def write(self):
+        os.makedirs(os.path.join(self.output_path, "search", "shards"), exist_ok=True)
+        prefixes = {self.prefix(term) for entry in self.docs.values() for term in entry["terms"]}
+        dirty = prefixes if self.rebuild else self.dirty
+        postings = {prefix: {} for prefix in dirty}
+        for entry in sorted(self.docs.values(), key=lambda entry: entry["id"]):
+            for term in entry["terms"]:
+                shard = postings.get(self.prefix(term))
+                if shard is not None:
+                    shard.setdefault(term, []).append(entry["id"])
+        for prefix, shard in postings.items():
+            if prefix in prefixes:
+                self.write_json(self.shard_file(prefix), {term: delta_encode(ids) for term, ids in shard.items()})
+                self.shards_written += 1
+            elif os.path.exists(self.shard_file(prefix)):
+                os.remove(self.shard_file(prefix))
+        outputs = [self.shard_file(prefix) for prefix in sorted(prefixes)]
+        if self.updated or self.rebuild:
+            docs = [None] * self.next_id
+            for entry in self.docs.values():
+                docs[entry["id"]] = [entry["url"], entry["title"]]
+            self.write_json(os.path.join(self.output_path, "search", "docs.json"), docs)
+            self.write_json(os.path.join(self.output_path, "search", "index.json"),
+                            {"prefix_length": self.prefix_length, "shards": sorted(prefixes), "docs": len(self.docs)})
+            with open_atomic(os.path.join(self.output_path, "search", "search.js")) as file:
+                file.write(SEARCH_SCRIPT)
+        outputs.extend(os.path.join(self.output_path, "search", name) for name in ("docs.json", "index.json", "search.js"))
+        return outputs
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.state_path) or ".", exist_ok=True)
+        with open_atomic(self.state_path) as file:
+            json.dump({"version": STATE_VERSION, "prefix_length": self.prefix_length, "base_path": self.base_path,
+                       "next_id": self.next_id, "docs": self.docs}, file)
+
+    def summary(self):
+        return (f"Search index: {len(self.docs)} pages, {self.updated} updated, "
+                f"{self.shards_written} shards written ({self.bytes_written} bytes)")
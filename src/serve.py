@@ -0,0 +1,189 @@
+import argparse
+import functools
+import os
+import threading
+import time
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+import main as build
+from discover import is_page
+from manifest import open_atomic
+from template import load_template
+from sync import sync_file
+from cache import BlockCache
+
+LIVE_RELOAD_PATH = "/__livereload"
+LIVE_RELOAD_SCRIPT = (
+    f'<script>new EventSource("{LIVE_RELOAD_PATH}").onmessage = () => location.reload();</script>'
+)
+
+
+def snapshot(paths):
+    files = {}
+    for path in paths:
+        if os.path.isfile(path):
+            stat = os.stat(path)
+            files[path] = (stat.st_mtime_ns, stat.st_size)
+        elif os.path.isdir(path):
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    if entry.is_dir():
+                        files.update(snapshot([entry.path]))
+                    else:
+                        stat = entry.stat()
+                        files[entry.path] = (stat.st_mtime_ns, stat.st_size)
+    return files
+
+
+def is_content(path):
+    return os.path.commonpath([path, build.content_path]) == build.content_path
+
+
+def output_for(source_file):
+    if is_content(source_file):
+        relative = os.path.relpath(source_file, build.content_path)
+        if is_page(relative):
+            relative = os.path.splitext(relative)[0] + ".html"
+    else:
+        relative = os.path.relpath(source_file, build.static_path)
+    return os.path.join(build.public_path, relative)
+
+
+def rebuild(source_file, template, cache=None):
+    output_file = output_for(source_file)
+    if not os.path.exists(source_file):
+        if os.path.exists(output_file):
+            os.remove(output_file)
+        return output_file
+    os.makedirs(os.path.dirname(output_file), exist_ok=True)
+    if is_content(source_file) and is_page(source_file):
+        with open_atomic(output_file) as file:
+            build.render_page(source_file, template, file.write,
+                              build.page_path(output_file, build.public_path), build.BuildOptions(cache=cache))
+    else:
+        sync_file(source_file, output_file)
+    return output_file
+
+
+class SiteWatcher():
+    def __init__(self, base_path, interval=0.2):
+        self.base_path = base_path
+        self.interval = interval
+        self.template = load_template(build.template_path, base_path)
+        self.cache = BlockCache()
+        self.files = snapshot(self.roots())
+        self.version = 0
+        self.reloaded = threading.Condition()
+
+    def roots(self):
+        return [build.content_path, build.static_path, build.template_path]
+
+    def rebuild(self, source_file):
+        rebuild(source_file, self.template, self.cache)
+
+    def poll(self):
+        files = snapshot(self.roots())
+        changed = {path for path in files.keys() | self.files.keys() if files.get(path) != self.files.get(path)}
+        self.files = files
+        if not changed:
+            return
+        start = time.perf_counter()
+        if build.template_path in changed:
+            self.template = load_template(build.template_path, self.base_path)
+            changed.discard(build.template_path)
+            changed.update(path for path in files if is_content(path) and is_page(path))
+        for path in sorted(changed):
+            try:
+                self.rebuild(path)
+            except Exception as error:
+                print(f"Failed to rebuild {path}: {error}")
+        print(f"Rebuilt {len(changed)} file(s) in {(time.perf_counter() - start) * 1000:.1f} ms")
+        with self.reloaded:
+            self.version += 1
+            self.reloaded.notify_all()
+
+    def watch(self):
+        while True:
+            time.sleep(self.interval)
+            self.poll()
+
+
+class LiveReloadHandler(SimpleHTTPRequestHandler):
+    watcher = None
+
+    def do_GET(self):
+        if self.watcher is None:
+            return super().do_GET()
+        if self.path == LIVE_RELOAD_PATH:
+            return self.send_events()
+        path = self.translate_path(self.path)
+        if self.path.split("?")[0].endswith("/"):
+            path = os.path.join(path, "index.html")
+        if path.endswith(".html") and os.path.isfile(path):
+            return self.send_html(path)
+        return super().do_GET()
+
+    def send_html(self, path):
+        with open(path, 'rb') as file:
+            html = file.read()
+        script = LIVE_RELOAD_SCRIPT.encode()
+        if b"</body>" in html:
+            html = html.replace(b"</body>", script + b"</body>", 1)
+        else:
+            html += script
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(html)))
+        self.send_header("Cache-Control", "no-cache")
+        self.end_headers()
+        self.wfile.write(html)
+
+    def send_events(self):
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.end_headers()
+        watcher = self.watcher
+        seen = watcher.version
+        try:
+            while True:
+                with watcher.reloaded:
+                    watcher.reloaded.wait_for(lambda: watcher.version != seen, timeout=15)
+                if watcher.version != seen:
+                    seen = watcher.version
+                    self.wfile.write(b"data: reload\n\n")
+                else:
+                    self.wfile.write(b": ping\n\n")
+                self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="main.py serve")
+    parser.add_argument("base_path", nargs="?", default="")
+    parser.add_argument("--watch", action="store_true",
+                        help="rebuild changed files and reload open pages")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--interval", type=float, default=0.2,
+                        help="seconds between checks for changed files")
+    args = parser.parse_args(argv)
+
+    build.main([args.base_path])
+    if args.watch:
+        LiveReloadHandler.watcher = SiteWatcher(build.base_path, args.interval)
+        threading.Thread(target=LiveReloadHandler.watcher.watch, daemon=True).start()
+
+    handler = functools.partial(LiveReloadHandler, directory=build.public_path)
+    server = ThreadingHTTPServer(("", args.port), handler)
+    print(f"Serving {build.public_path} on http://localhost:{args.port}/")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
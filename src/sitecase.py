@@ -0,0 +1,52 @@
+import contextlib
+import io
+import os
+import tempfile
+import unittest
+
+import main as build
+
+PATHS = ("public_path", "static_path", "content_path", "template_path", "cache_path", "base_path")
+TEMPLATE = "<title>{{ Title }}</title><p>{{ path }} {{ date }}</p><main>{{ Content }}</main>"
+
+
+class SiteTestCase(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = self.tmp.name
+        os.makedirs(os.path.join(self.root, "content"))
+        os.makedirs(os.path.join(self.root, "static"))
+        self.write("template.html", TEMPLATE)
+        self.saved = {name: getattr(build, name) for name in PATHS}
+        build.public_path = os.path.join(self.root, "docs")
+        build.static_path = os.path.join(self.root, "static")
+        build.content_path = os.path.join(self.root, "content")
+        build.template_path = os.path.join(self.root, "template.html")
+        build.cache_path = os.path.join(self.root, ".cache")
+
+    def tearDown(self):
+        for name, value in self.saved.items():
+            setattr(build, name, value)
+        self.tmp.cleanup()
+
+    def write(self, path, text):
+        path = os.path.join(self.root, path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as file:
+            file.write(text)
+        return path
+
+    def build(self, *argv):
+        with contextlib.redirect_stdout(io.StringIO()) as output:
+            self.assertEqual(build.main(list(argv)), 0)
+        return output.getvalue()
+
+    def snapshot(self, path=None, skip=()):
+        path = path or build.public_path
+        files = {}
+        for directory, _, names in os.walk(path):
+            for name in names:
+                if name not in skip:
+                    with open(os.path.join(directory, name), "rb") as file:
+                        files[os.path.relpath(os.path.join(directory, name), path)] = file.read()
+        return files
@@ -0,0 +1,136 @@
+import os
+import shutil
+from concurrent.futures import ThreadPoolExecutor, wait
+
+from manifest import hash_file, temp_path
+from profiler import NULL_PROFILER
+
+COPIED = "copied"
+LINKED = "linked"
+SKIPPED = "skipped"
+
+
+def is_unchanged(source_file, dest_file, compare="mtime"):
+    try:
+        dest_stat = os.stat(dest_file)
+    except FileNotFoundError:
+        return False
+    source_stat = os.stat(source_file)
+    if source_stat.st_size != dest_stat.st_size:
+        return False
+    if compare == "hash":
+        return hash_file(source_file) == hash_file(dest_file)
+    return source_stat.st_mtime_ns == dest_stat.st_mtime_ns
+
+
+def fast_copy(source_file, dest_file):
+    if not hasattr(os, "copy_file_range"):
+        shutil.copyfile(source_file, dest_file)
+        return
+    with open(source_file, "rb") as source, open(dest_file, "wb") as dest:
+        size = os.fstat(source.fileno()).st_size
+        try:
+            while size > 0:
+                sent = os.copy_file_range(source.fileno(), dest.fileno(), size)
+                if sent == 0:
+                    break
+                size -= sent
+        except OSError:
+            source.seek(0)
+            dest.seek(0)
+            dest.truncate()
+            shutil.copyfileobj(source, dest)
+
+
+def sync_file(source_file, dest_file, compare="mtime", link=False):
+    if is_unchanged(source_file, dest_file, compare):
+        return SKIPPED, 0
+    if link and replace_with_link(source_file, dest_file):
+        return LINKED, 0
+    replace_with_copy(source_file, dest_file)
+    return COPIED, os.path.getsize(dest_file)
+
+
+def replace_with_link(source_file, dest_file):
+    temp_file = temp_path(dest_file)
+    try:
+        os.link(source_file, temp_file)
+    except OSError:
+        return False
+    os.replace(temp_file, dest_file)
+    if os.path.lexists(temp_file):
+        os.remove(temp_file)
+    return True
+
+
+def replace_with_copy(source_file, dest_file):
+    temp_file = temp_path(dest_file)
+    try:
+        fast_copy(source_file, temp_file)
+        shutil.copystat(source_file, temp_file)
+        os.replace(temp_file, dest_file)
+    except BaseException:
+        if os.path.lexists(temp_file):
+            os.remove(temp_file)
+        raise
+
+
+class AssetSync():
+    def __init__(self, compare="mtime", link=False, jobs=None, profiler=NULL_PROFILER, on_synced=None, dedup=None,
+                 fingerprint=None):
+        self.compare = compare
+        self.link = link
+        self.profiler = profiler
+        self.on_synced = on_synced
+        self.dedup = dedup
+        self.fingerprint = fingerprint
+        self.urls = None
+        self.pool = ThreadPoolExecutor(max_workers=jobs)
+        self.futures = []
+        self.counts = {COPIED: 0, LINKED: 0, SKIPPED: 0}
+        self.bytes_moved = 0
+
+    def add(self, source_file, dest_file):
+        future = self.pool.submit(self.sync, source_file, dest_file)
+        self.futures.append((source_file, future))
+
+    def sync(self, source_file, dest_file):
+        with self.profiler.phase("copy", source_file):
+            if self.dedup:
+                digest = self.dedup.register(source_file, dest_file)
+                result = self.dedup.materialize(source_file, dest_file, digest)
+            else:
+                result = sync_file(source_file, dest_file, self.compare, self.link)
+            if self.fingerprint:
+                self.fingerprint.publish(source_file, dest_file)
+        if self.on_synced:
+            self.on_synced(dest_file)
+        return result
+
+    def url_map(self):
+        self.wait()
+        url_map = dict(self.fingerprint.urls) if self.fingerprint else {}
+        shared_files = []
+        if self.dedup and self.dedup.rewrite_urls:
+            shared_map, shared_files = self.dedup.publish_shared()
+            url_map.update(shared_map)
+        self.urls = url_map
+        return url_map, shared_files
+
+    def wait(self):
+        wait([future for _, future in self.futures])
+
+    def finish(self):
+        self.pool.shutdown(wait=True)
+        for source_file, future in self.futures:
+            try:
+                result, size = future.result()
+            except OSError as error:
+                raise Exception(f"Failed to copy {source_file}: {error}") from error
+            self.counts[result] += 1
+            self.bytes_moved += size
+        self.futures = []
+
+    def summary(self):
+        return (f"Static files: {self.counts[COPIED]} copied, {self.counts[LINKED]} linked, "
+                f"{self.counts[SKIPPED]} unchanged, {self.bytes_moved} bytes moved")
@@ -0,0 +1,55 @@
+import re
+
+SLOT_PATTERN = re.compile(r"\{\{ *(\w+) *\}\}")
+URL_ATTR_PATTERN = re.compile(r"(href|src)=/")
+URL_PATTERN = re.compile(r"(href|src)=(/[^\s>]*)")
+
+
+class Template():
+    def __init__(self, source, base_path="", url_map=None):
+        self.base_path = base_path
+        self.url_map = url_map or {}
+        self.pieces = []
+        self.slots = {}
+        position = 0
+        for match in SLOT_PATTERN.finditer(source):
+            self.pieces.append(self.rewrite_urls(source[position:match.start()]))
+            self.slots[len(self.pieces)] = (match.group(1), match.group(0))
+            self.pieces.append(match.group(0))
+            position = match.end()
+        self.pieces.append(self.rewrite_urls(source[position:]))
+
+    def rewrite_urls(self, html):
+        if self.url_map:
+            return URL_PATTERN.sub(self.rewrite_url, html)
+        return URL_ATTR_PATTERN.sub(lambda match: f"{match.group(1)}={self.base_path}", html)
+
+    def rewrite_url(self, match):
+        url = self.url_map.get(match.group(2), match.group(2))
+        return f"{match.group(1)}={self.base_path}{url[1:]}"
+
+    def url_writer(self, write):
+        def rewrite(chunk):
+            write(self.rewrite_urls(chunk) if "=/" in chunk else chunk)
+        return rewrite
+
+    def write(self, write, **values):
+        values.setdefault("base_path", self.base_path)
+        for index, piece in enumerate(self.pieces):
+            if index in self.slots:
+                name, placeholder = self.slots[index]
+                piece = values.get(name, placeholder)
+                if callable(piece):
+                    piece(write)
+                    continue
+            write(piece)
+
+    def render(self, **values):
+        chunks = []
+        self.write(chunks.append, **values)
+        return "".join(chunks)
+
+
+def load_template(path, base_path="", url_map=None):
+    with open(path, 'r', encoding='utf-8') as file:
+        return Template(file.read(), base_path, url_map)
@@ -0,0 +1,89 @@
+import json
+import os
+import tempfile
+import unittest
+
+from assets import DedupStore, Fingerprinter, HashIndex
+from sync import AssetSync
+
+
+class TestDedup(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = self.tmp.name
+        self.output = os.path.join(self.root, "docs")
+        os.makedirs(os.path.join(self.output, "blog"))
+        self.sources = []
+        for name, data in [("a.png", b"same"), ("b.png", b"same"), ("c.png", b"other")]:
+            path = os.path.join(self.root, name)
+            with open(path, "wb") as file:
+                file.write(data)
+            self.sources.append(path)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_hash_index_reuses_cached_hash(self):
+        index = HashIndex(os.path.join(self.root, "hashes.json"))
+        digest = index.hash(self.sources[0])
+        index.entries[self.sources[0]][2] = "cached"
+        self.assertEqual(index.hash(self.sources[0]), "cached")
+        self.assertNotEqual(digest, "cached")
+
+    def test_duplicates_are_hardlinked_and_share_a_url(self):
+        index = HashIndex(os.path.join(self.root, "hashes.json"))
+        dedup = DedupStore(os.path.join(self.root, "objects"), index, self.output, rewrite_urls=True)
+        assets = AssetSync(dedup=dedup)
+        dests = [
+            os.path.join(self.output, "a.png"),
+            os.path.join(self.output, "blog", "b.png"),
+            os.path.join(self.output, "c.png"),
+        ]
+        for source, dest in zip(self.sources, dests):
+            assets.add(source, dest)
+        assets.wait()
+        url_map, shared_files = dedup.publish_shared()
+        assets.finish()
+        self.assertTrue(os.path.samefile(dests[0], dests[1]))
+        self.assertFalse(os.path.samefile(dests[0], dests[2]))
+        self.assertEqual(url_map["/a.png"], url_map["/blog/b.png"])
+        self.assertNotIn("/c.png", url_map)
+        self.assertEqual(len(shared_files), 1)
+        self.assertTrue(os.path.samefile(shared_files[0], dests[0]))
+
+    def test_fingerprint(self):
+        index = HashIndex(os.path.join(self.root, "hashes.json"))
+        fingerprint = Fingerprinter(index, self.output)
+        assets = AssetSync(fingerprint=fingerprint)
+        dest = os.path.join(self.output, "blog", "a.png")
+        assets.add(self.sources[0], dest)
+        assets.finish()
+        digest = index.hash(self.sources[0])
+        self.assertEqual(fingerprint.urls, {"/blog/a.png": f"/blog/a.{digest[:10]}.png"})
+        self.assertTrue(os.path.samefile(dest, fingerprint.outputs()[0]))
+
+    def test_fingerprint_manifest_uses_shared_urls(self):
+        index = HashIndex(os.path.join(self.root, "hashes.json"))
+        dedup = DedupStore(os.path.join(self.root, "objects"), index, self.output, rewrite_urls=True)
+        fingerprint = Fingerprinter(index, self.output)
+        assets = AssetSync(dedup=dedup, fingerprint=fingerprint)
+        assets.add(self.sources[0], os.path.join(self.output, "a.png"))
+        assets.add(self.sources[1], os.path.join(self.output, "blog", "b.png"))
+        assets.add(self.sources[2], os.path.join(self.output, "c.png"))
+        url_map, _ = assets.url_map()
+        assets.finish()
+        shared_url = f"/_assets/{index.hash(self.sources[0])[:16]}.png"
+        other = index.hash(self.sources[2])
+        self.assertEqual(url_map, {
+            "/a.png": shared_url,
+            "/blog/b.png": shared_url,
+            "/c.png": f"/c.{other[:10]}.png",
+        })
+        manifest_path = os.path.join(self.output, "asset-manifest.json")
+        fingerprint.write_manifest(manifest_path, assets.urls)
+        with open(manifest_path, "r", encoding="utf-8") as file:
+            self.assertEqual(json.load(file), url_map)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,44 @@
+import tempfile
+import unittest
+
+from cache import BlockCache
+from document import parse_document
+from utils import BlockType, markdown_to_html_node
+
+
+class TestBlockCache(unittest.TestCase):
+    def test_hits_and_misses(self):
+        cache = BlockCache()
+        self.assertEqual(cache.fragment("**bold**", BlockType.PARAGRAPH), "<p><b>bold</b></p>")
+        self.assertEqual(cache.fragment("**bold**", BlockType.PARAGRAPH), "<p><b>bold</b></p>")
+        self.assertEqual(cache.counts(), (1, 0, 1))
+
+    def test_block_type_is_part_of_key(self):
+        cache = BlockCache()
+        self.assertEqual(cache.fragment("# x", BlockType.HEADING), "<h1>x</h1>")
+        self.assertEqual(cache.fragment("# x", BlockType.PARAGRAPH), "<p># x</p>")
+
+    def test_lru_eviction(self):
+        cache = BlockCache(max_entries=2)
+        for text in ["a", "b", "c"]:
+            cache.fragment(text, BlockType.PARAGRAPH)
+        self.assertEqual(len(cache.entries), 2)
+        cache.fragment("a", BlockType.PARAGRAPH)
+        self.assertEqual(cache.misses, 4)
+
+    def test_disk_store(self):
+        with tempfile.TemporaryDirectory() as directory:
+            BlockCache(directory=directory).fragment("_x_", BlockType.PARAGRAPH)
+            cache = BlockCache(directory=directory)
+            self.assertEqual(cache.fragment("_x_", BlockType.PARAGRAPH), "<p><i>x</i></p>")
+            self.assertEqual(cache.counts(), (0, 1, 0))
+
+    def test_document_output_unchanged(self):
+        markdown = "# Title\n\nsome **text**\n\n- a\n- b"
+        chunks = []
+        parse_document(markdown, BlockCache()).write_html(chunks.append)
+        self.assertEqual("".join(chunks), markdown_to_html_node(markdown))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,63 @@
+import gzip
+import os
+import tempfile
+import unittest
+
+from compress import Compressor, remove_gzip
+
+
+class TestCompressor(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = self.tmp.name
+        self.page = os.path.join(self.root, "index.html")
+        with open(self.page, "w") as file:
+            file.write("<p>hello</p>" * 200)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def compress(self, min_size=1024):
+        compressor = Compressor(os.path.join(self.root, "cache", "gzip.json"), min_size=min_size)
+        compressor.add(self.page)
+        compressor.add(os.path.join(self.root, "image.png"))
+        compressor.finish()
+        return compressor
+
+    def test_compresses_and_skips_unchanged(self):
+        self.assertEqual(self.compress().compressed, 1)
+        with gzip.open(self.page + ".gz", "rt") as file:
+            self.assertEqual(file.read(), "<p>hello</p>" * 200)
+        self.assertEqual(self.compress().unchanged, 1)
+        with open(self.page, "a") as file:
+            file.write("<p>more</p>")
+        self.assertEqual(self.compress().compressed, 1)
+
+    def test_small_files_are_not_compressed(self):
+        self.compress()
+        self.compress(min_size=10 ** 6)
+        self.assertFalse(os.path.exists(self.page + ".gz"))
+
+    def test_index_is_keyed_by_output_root(self):
+        self.compress()
+        shard = os.path.join(self.root, "shard")
+        os.makedirs(shard)
+        with open(os.path.join(shard, "index.html"), "w") as file:
+            file.write("<p>shard</p>" * 200)
+        compressor = Compressor(os.path.join(self.root, "cache", "gzip.json"))
+        compressor.add(os.path.join(shard, "index.html"))
+        compressor.finish()
+        with open(self.page, "w") as file:
+            file.write("<p>shard</p>" * 200)
+        self.assertEqual(self.compress().compressed, 1)
+        with gzip.open(self.page + ".gz", "rt") as file:
+            self.assertEqual(file.read(), "<p>shard</p>" * 200)
+
+    def test_remove_gzip(self):
+        self.compress()
+        self.assertEqual(remove_gzip(self.root, ["index.html", "missing.html"]), 1)
+        self.assertFalse(os.path.exists(self.page + ".gz"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,72 @@
+import datetime
+import os
+import socket
+import unittest
+
+import main as build
+from client import HEADER, recv_message, send_message
+from daemon import RenderDaemon
+from sitecase import SiteTestCase
+
+
+class TestProtocol(unittest.TestCase):
+    def test_round_trip(self):
+        left, right = socket.socketpair()
+        with left, right:
+            message = {"op": "render", "markdown": "# Title\n\nünïcode " * 1000}
+            send_message(left, message)
+            send_message(left, {"op": "ping"})
+            self.assertEqual(recv_message(right), message)
+            self.assertEqual(recv_message(right), {"op": "ping"})
+            left.close()
+            self.assertIsNone(recv_message(right))
+
+    def test_truncated_message(self):
+        left, right = socket.socketpair()
+        with left, right:
+            left.sendall(HEADER.pack(10) + b"{}")
+            left.close()
+            with self.assertRaises(Exception):
+                recv_message(right)
+
+
+class TestRenderDaemon(unittest.TestCase):
+    def test_ping_and_unknown_request(self):
+        daemon = RenderDaemon()
+        self.assertEqual(daemon.handle({"op": "ping"}), {"ok": True})
+        with self.assertRaisesRegex(Exception, "Unknown request"):
+            daemon.handle({"op": "explode"})
+
+
+class TestDaemonMatchesBuild(SiteTestCase):
+    def setUp(self):
+        super().setUp()
+        self.markdown = "# First post\n\nSome **bold** text and [a link](/about)\n\n- one\n- two\n"
+        self.source_file = self.write(os.path.join("content", "blog", "first.md"), self.markdown)
+        self.build("/")
+        self.output_file = os.path.join(build.public_path, "blog", "first.html")
+        with open(self.output_file, "r", encoding="utf-8") as file:
+            self.expected = file.read()
+
+    def test_render_and_page_match_build(self):
+        daemon = RenderDaemon()
+        date = datetime.date.fromtimestamp(os.stat(self.source_file).st_mtime).isoformat()
+        page = daemon.handle({"op": "page", "markdown": self.markdown, "path": "blog/first.html", "date": date})
+        self.assertEqual(page["html"], self.expected)
+        body = daemon.handle({"op": "render", "markdown": self.markdown})["html"]
+        self.assertIn(f"<main>{body}</main>", self.expected)
+
+    def test_build_matches_build(self):
+        daemon = RenderDaemon()
+        for path in (self.source_file, os.path.relpath(self.source_file)):
+            os.remove(self.output_file)
+            response = daemon.handle({"op": "build", "path": path})
+            self.assertEqual(response["output"], self.output_file)
+            with open(self.output_file, "r", encoding="utf-8") as file:
+                self.assertEqual(file.read(), self.expected)
+        with self.assertRaisesRegex(Exception, "is not under"):
+            daemon.handle({"op": "build", "path": build.template_path})
+
+
+if __name__ == "__main__":
+    unittest.main()
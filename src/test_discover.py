@@ -0,0 +1,76 @@
+import os
+import tempfile
+import unittest
+
+from discover import WorkList, parse_shard, scan_files, shard_of
+
+
+class TestDiscover(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = self.tmp.name
+        for path in ("index.md", "b/post.markdown", "b/image.png", "a/style.css", "drafts/wip.md", "b/notes.txt"):
+            path = os.path.join(self.root, path)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "w") as file:
+                file.write("x")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_scan_is_flat_and_sorted(self):
+        directories, files = scan_files(self.root)
+        self.assertEqual(directories, ["a", "b", "drafts"])
+        self.assertEqual(files, ["a/style.css", "b/image.png", "b/notes.txt", "b/post.markdown", "drafts/wip.md",
+                                 "index.md"])
+
+    def test_include_and_exclude(self):
+        directories, files = scan_files(self.root, include=["*.md", "*.markdown", "*.png"], exclude=["drafts"])
+        self.assertEqual(directories, ["a", "b"])
+        self.assertEqual(files, ["b/image.png", "b/post.markdown", "index.md"])
+
+    def test_work_list_splits_pages_and_assets(self):
+        work = WorkList(exclude=["*.txt"])
+        work.scan(self.root, "out")
+        self.assertEqual(work.pages, [
+            (os.path.join(self.root, "b/post.markdown"), os.path.join("out", "b/post.html")),
+            (os.path.join(self.root, "drafts/wip.md"), os.path.join("out", "drafts/wip.html")),
+            (os.path.join(self.root, "index.md"), os.path.join("out", "index.html")),
+        ])
+        self.assertEqual([dest for _, dest in work.assets],
+                         [os.path.join("out", "a/style.css"), os.path.join("out", "b/image.png")])
+
+    def test_shards_partition_the_work_list(self):
+        everything = WorkList()
+        everything.scan(self.root, "out")
+        pages, assets = [], []
+        for index in range(3):
+            work = WorkList(shard=(index, 3))
+            work.scan(self.root, "out")
+            pages.extend(work.pages)
+            assets.extend(work.assets)
+        self.assertEqual(sorted(pages), everything.pages)
+        self.assertEqual(sorted(assets), everything.assets)
+
+    def test_shard_of_is_stable(self):
+        # Shards built on different hosts are merged, so these values must
+        # never change between runs, machines or Python versions.
+        self.assertEqual(shard_of("content/index.md", 7), 3)
+        self.assertEqual(shard_of("content/blog/tom/index.md", 7), 1)
+        self.assertEqual(shard_of("static/index.css", 3), 2)
+
+    def test_selects_follows_include_and_exclude(self):
+        work = WorkList(include=["*.md"], exclude=["drafts"])
+        self.assertTrue(work.selects("b/post.md"))
+        self.assertFalse(work.selects("drafts/wip.md"))
+        self.assertFalse(work.selects("a/style.css"))
+
+    def test_parse_shard(self):
+        self.assertEqual(parse_shard("2/4"), (2, 4))
+        for value in ("4/4", "-1/2", "1", "a/b"):
+            with self.assertRaises(Exception):
+                parse_shard(value)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,46 @@
+import unittest
+
+from document import parse_document
+from utils import extract_title, markdown_to_html_node
+
+
+MARKDOWN = """# The **Title**
+
+Intro with a [link](/blog/tom) and ![a picture](/images/tom.png).
+
+## Section
+
+- [another](https://example.com)
+
+### Subsection
+"""
+
+
+class TestDocument(unittest.TestCase):
+    def test_title_matches_extract_title(self):
+        document = parse_document(MARKDOWN)
+        self.assertEqual(document.title, extract_title(MARKDOWN))
+
+    def test_html_matches_markdown_to_html_node(self):
+        chunks = []
+        parse_document(MARKDOWN).write_html(chunks.append)
+        self.assertEqual("".join(chunks), markdown_to_html_node(MARKDOWN))
+
+    def test_headings(self):
+        self.assertEqual(
+            parse_document(MARKDOWN).headings,
+            [(1, "The **Title**"), (2, "Section"), (3, "Subsection")],
+        )
+
+    def test_references(self):
+        document = parse_document(MARKDOWN)
+        self.assertEqual(document.links, [("link", "/blog/tom"), ("another", "https://example.com")])
+        self.assertEqual(document.images, [("a picture", "/images/tom.png")])
+
+    def test_missing_title(self):
+        with self.assertRaises(Exception):
+            parse_document("no heading here").title
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,50 @@
+import os
+import tempfile
+import unittest
+
+from links import LinkChecker, candidates
+
+
+class TestCandidates(unittest.TestCase):
+    def test_resolution(self):
+        self.assertEqual(candidates("/", "blog/a/index.html"), ["index.html"])
+        self.assertEqual(candidates("/blog/tom", "index.html"),
+                         ["blog/tom", "blog/tom/index.html", "blog/tom.html"])
+        self.assertEqual(candidates("images/a.png#top", "blog/a/index.html")[0], "blog/a/images/a.png")
+        self.assertEqual(candidates("../b/", "blog/a/index.html"), ["blog/b/index.html"])
+        self.assertEqual(candidates("../../../x", "blog/a/index.html"), [])
+        self.assertIsNone(candidates("https://example.com/", "index.html"))
+
+
+class TestLinkChecker(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.source = os.path.join(self.tmp.name, "index.md")
+        self.index = os.path.join(self.tmp.name, "cache", "links.json")
+        with open(self.source, "w") as file:
+            file.write("# Home\n\n[about](/about) [missing](/missing)\n")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def check(self, outputs):
+        checker = LinkChecker(self.index)
+        checker.update(self.source, "index.html")
+        checker.retain(["index.html"])
+        broken = checker.check(outputs)
+        checker.save()
+        return checker, broken
+
+    def test_incremental_checks(self):
+        checker, broken = self.check(["index.html", "about/index.html"])
+        self.assertEqual(broken, [(self.source, 3, "link", "/missing")])
+        checker, broken = self.check(["index.html", "about/index.html", "missing.html"])
+        self.assertEqual((broken, checker.checked), ([], 1))
+        checker, broken = self.check(["index.html", "about/index.html", "missing.html"])
+        self.assertEqual((broken, checker.checked), ([], 0))
+        checker, broken = self.check(["index.html", "missing.html"])
+        self.assertEqual((broken, checker.checked), ([(self.source, 3, "link", "/about")], 1))
+
+
+if __name__ == "__main__":
+    unittest.main()
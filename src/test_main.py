@@ -0,0 +1,72 @@
+import json
+import os
+import shutil
+import unittest
+
+import main as build
+from sitecase import SiteTestCase
+
+
+class TestParallelBuild(SiteTestCase):
+    def setUp(self):
+        super().setUp()
+        for index in range(12):
+            self.write(os.path.join("content", f"section{index % 3}", f"page{index}.md"),
+                       f"# Page {index}\n\nSome **bold** and _italic_ text with `code` and [a link](/page{index})\n\n"
+                       f"```\nfenced {index}\n```\n\n- one\n- two\n\n> quoted {index}\n")
+
+    def clean_build(self, *argv):
+        shutil.rmtree(build.public_path, ignore_errors=True)
+        self.build("/", *argv)
+        return self.snapshot()
+
+    def test_parallel_build_matches_serial_build(self):
+        serial = self.clean_build()
+        self.assertEqual(len(serial), 13)
+        self.assertEqual(self.clean_build("-j", "2"), serial)
+        self.assertEqual(self.clean_build("-j", "2", "--block-cache", "memory"), serial)
+
+    def test_profiled_parallel_build_times_each_write_once(self):
+        trace = os.path.join(self.root, "trace.json")
+        self.clean_build("-j", "2", "--trace", trace)
+        with open(trace) as file:
+            events = json.load(file)["traceEvents"]
+        writes = [event["args"]["file"] for event in events if event["name"] == "write"]
+        self.assertEqual(len(writes), 12)
+        self.assertEqual(len(set(writes)), 12)
+
+    def test_large_pages_stream_in_every_mode(self):
+        serial = self.clean_build("--search")
+        threshold = build.stream_threshold
+        build.stream_threshold = 100
+        try:
+            for argv in ((), ("-j", "2"), ("--pipeline",), ("--pipeline", "--minify"), ("-j", "2", "--minify")):
+                minified = "--minify" in argv
+                expected = self.clean_build("--search", "--minify") if minified else serial
+                self.assertEqual(self.clean_build("--search", *argv), expected)
+        finally:
+            build.stream_threshold = threshold
+
+
+
+class TestFilteredBuild(SiteTestCase):
+    def test_filter_keeps_outputs_outside_it(self):
+        self.write("content/index.md", "# Home")
+        self.write("content/blog/post.md", "# Post")
+        self.write("static/index.css", "body {}")
+        self.build("/")
+        before = self.snapshot(skip=(".manifest.json",))
+        self.write("content/blog/post.md", "# Edited")
+        output = self.build("/", "--include", "blog/*")
+        self.assertNotIn("Pruned", output)
+        after = self.snapshot(skip=(".manifest.json",))
+        self.assertEqual(sorted(after), sorted(before))
+        self.assertIn(b"Edited", after[os.path.join("blog", "post.html")])
+        os.remove(os.path.join(self.root, "content", "index.md"))
+        self.build("/", "--include", "blog/*")
+        self.assertFalse(os.path.exists(os.path.join(build.public_path, "index.html")))
+        self.assertTrue(os.path.exists(os.path.join(build.public_path, "index.css")))
+
+
+if __name__ == "__main__":
+    unittest.main()
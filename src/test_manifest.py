@@ -0,0 +1,88 @@
+import os
+import tempfile
+import unittest
+
+from manifest import BuildManifest, open_atomic
+
+
+class TestBuildManifest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = self.tmp.name
+        self.output = os.path.join(self.root, "docs")
+        os.makedirs(self.output)
+        self.template = os.path.join(self.root, "template.html")
+        self.source = os.path.join(self.root, "index.md")
+        self.page = os.path.join(self.output, "index.html")
+        with open(self.template, "w") as file:
+            file.write("{{ Content }}")
+        with open(self.source, "w") as file:
+            file.write("# Title")
+        with open(self.page, "w") as file:
+            file.write("<h1>Title</h1>")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def build(self, base_path="", **page_options):
+        manifest = BuildManifest(self.output, self.template, base_path, incremental=True)
+        manifest.page_options.update(page_options)
+        inputs = manifest.page_inputs(self.source)
+        fresh = manifest.is_fresh(self.page, inputs)
+        manifest.record(self.page, inputs)
+        manifest.save()
+        return fresh
+
+    def test_unchanged_page_is_fresh(self):
+        self.assertFalse(self.build())
+        self.assertTrue(self.build())
+
+    def test_source_change_invalidates(self):
+        self.build()
+        with open(self.source, "a") as file:
+            file.write("\nmore")
+        self.assertFalse(self.build())
+
+    def test_template_and_base_path_invalidate(self):
+        self.build()
+        self.assertFalse(self.build("/site/"))
+        with open(self.template, "a") as file:
+            file.write("\n")
+        self.assertFalse(self.build("/site/"))
+        self.assertTrue(self.build("/site/"))
+
+    def test_page_options_invalidate(self):
+        self.build(url_map="a")
+        self.assertTrue(self.build(url_map="a"))
+        self.assertFalse(self.build(url_map="b"))
+        self.assertFalse(self.build())
+
+    def test_prune_removes_orphans_from_previous_build(self):
+        nested = os.path.join(self.output, "blog", "post")
+        os.makedirs(nested)
+        orphan = os.path.join(nested, "old.html")
+        for path in (orphan, f"{orphan}.gz"):
+            with open(path, "w") as file:
+                file.write("old")
+        manifest = BuildManifest(self.output, self.template, "")
+        manifest.record(self.page, manifest.page_inputs(self.source))
+        manifest.record(orphan, manifest.page_inputs(self.source))
+        manifest.save()
+        manifest = BuildManifest(self.output, self.template, "")
+        manifest.record(self.page, manifest.page_inputs(self.source))
+        self.assertEqual(manifest.prune(), 2)
+        self.assertTrue(os.path.exists(self.page))
+        self.assertFalse(os.path.exists(os.path.join(self.output, "blog")))
+
+    def test_open_atomic_keeps_old_file_on_error(self):
+        with self.assertRaises(ValueError):
+            with open_atomic(self.page) as file:
+                file.write("partial")
+                raise ValueError()
+        with open(self.page) as file:
+            self.assertEqual(file.read(), "<h1>Title</h1>")
+        self.assertEqual(os.listdir(self.output), ["index.html"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,54 @@
+import os
+import shutil
+import unittest
+
+import main as build
+from merge import merge_shards
+from sitecase import SiteTestCase
+
+PAGES = {
+    "index.md": "# Home\n\n[Post](/blog/first)",
+    "blog/first.md": "# First\n\nHello",
+    "blog/second.md": "# Second\n\nWorld",
+    "about.md": "# About\n\nUs",
+}
+
+
+class TestMerge(SiteTestCase):
+    def setUp(self):
+        super().setUp()
+        for path, text in PAGES.items():
+            self.write(os.path.join("content", path), text)
+        self.write(os.path.join("static", "index.css"), "body {}")
+        self.write(os.path.join("static", "images", "logo.png"), "png")
+
+    def snapshot(self, path=None):
+        return super().snapshot(path, skip=(".manifest.json",))
+
+    def build_shards(self):
+        self.build("/", "--shard", "0/2")
+        self.build("/", "--shard", "1/2")
+        return [f"{build.public_path}.shard-0-of-2", f"{build.public_path}.shard-1-of-2"]
+
+    def test_merge_matches_full_build(self):
+        self.build("/")
+        expected = self.snapshot(build.public_path)
+        shutil.rmtree(build.public_path)
+        shards = self.build_shards()
+        for _ in range(2):
+            merged, conflicts, missing = merge_shards(shards, build.public_path)
+            self.assertEqual((merged, conflicts, missing), (len(expected), [], []))
+            self.assertEqual(self.snapshot(build.public_path), expected)
+
+    def test_missing_shard_aborts_before_writing(self):
+        shards = self.build_shards()
+        merge_shards(shards, build.public_path)
+        before = self.snapshot(build.public_path)
+        merged, conflicts, missing = merge_shards(shards[:1], build.public_path)
+        self.assertEqual((merged, conflicts), (0, []))
+        self.assertIn("shard 1/2", missing)
+        self.assertEqual(self.snapshot(build.public_path), before)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,55 @@
+import os
+import tempfile
+import unittest
+
+from metadata import MetadataIndex, collection_of, listing_html
+
+
+class TestMetadataIndex(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.index = MetadataIndex(os.path.join(self.tmp.name, "cache", "pages.sqlite"))
+
+    def tearDown(self):
+        self.index.close()
+        self.tmp.cleanup()
+
+    def add(self, path, markdown, mtime):
+        source = os.path.join(self.tmp.name, path.replace("/", "_") + ".md")
+        with open(source, "w") as file:
+            file.write(markdown)
+        os.utime(source, ns=(mtime, mtime))
+        self.index.update(source, path)
+        return source
+
+    def test_collection_of(self):
+        self.assertEqual(collection_of("blog/tom/index.html"), "blog")
+        self.assertEqual(collection_of("blog/post.html"), "blog")
+        self.assertEqual(collection_of("contact/index.html"), "")
+
+    def test_incremental_updates_and_queries(self):
+        self.add("blog/a/index.html", "# Zebra\n\n## Intro\n\none two three", 1_000_000_000)
+        source = self.add("blog/b/index.html", "# Apple", 2_000_000_000)
+        self.add("notes/c.html", "# Note", 3_000_000_000)
+        self.index.update(source, "blog/b/index.html")
+        self.assertEqual((self.index.updated, self.index.unchanged), (3, 1))
+        self.assertEqual(self.index.collections(), ["blog", "notes"])
+        by_date = self.index.pages("blog")
+        self.assertEqual([page["title"] for page in by_date], ["Apple", "Zebra"])
+        self.assertEqual(by_date[1]["headings"], [[1, "Zebra"], [2, "Intro"]])
+        self.assertEqual(by_date[1]["words"], 5)
+        self.assertEqual([page["title"] for page in self.index.pages("blog", "title", 1, 1)], ["Zebra"])
+        self.index.retain(["blog/a/index.html"])
+        self.assertEqual(self.index.collections(), ["blog"])
+        self.assertEqual(self.index.count("blog"), 1)
+
+    def test_listing_links_between_pages(self):
+        entries = [{"path": "blog/a/index.html", "title": "A", "mtime_ns": 0}]
+        title, html = listing_html("blog", entries, 2, 3, "blog/index.html")
+        self.assertEqual(title, "Blog (page 2)")
+        self.assertIn("<a href=/blog/a>A</a>", html)
+        self.assertIn("<a href=/blog>Previous</a> <a href=/blog/page/3>Next</a>", html)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,33 @@
+import unittest
+
+from minify import Minifier
+
+
+class TestMinify(unittest.TestCase):
+    def test_collapses_whitespace_and_strips_comments(self):
+        html = "<html>\n  <head>\n    <title>T</title>\n  </head>\n  <!-- note -->\n  <body><p>a   <b>b</b>\n <i>c</i>  </p></body>\n</html>"
+        self.assertEqual(Minifier().minify(html),
+                         "<html><head><title>T</title></head><body><p>a <b>b</b> <i>c</i></p></body></html>")
+
+    def test_pre_and_code_are_untouched(self):
+        html = "<div>\n<pre><code>  keep\n    <!-- this --> </code></pre>\n<p>x <code>a  b</code> y</p></div>"
+        self.assertEqual(Minifier().minify(html),
+                         "<div><pre><code>  keep\n    <!-- this --> </code></pre><p>x <code>a  b</code> y</p></div>")
+
+    def test_chunk_boundaries_do_not_change_output(self):
+        html = "<div>\n  <p>one  two</p> <!-- c -->\n<pre> x\n y </pre>\n  <a href=/x>  link </a>\n</div>"
+        minifier = Minifier()
+        expected = minifier.minify(html)
+        for size in range(1, 12):
+            chunks = []
+            stream = minifier.stream(chunks.append)
+            for start in range(0, len(html), size):
+                stream.write(html[start:start + size])
+            stream.close()
+            self.assertEqual("".join(chunks), expected)
+        self.assertEqual(minifier.pages, 12)
+        self.assertLess(minifier.bytes_out, minifier.bytes_in)
+
+
+if __name__ == "__main__":
+    unittest.main()
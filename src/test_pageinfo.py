@@ -0,0 +1,47 @@
+import unittest
+
+from document import parse_document
+from pageinfo import PageInfo, count_words, document_info
+from utils import iter_numbered_blocks
+
+
+class TestPageInfo(unittest.TestCase):
+    def test_terms_skip_code_and_link_targets(self):
+        document = parse_document("# The Ring\n\nSee [Mordor](/blog/mordor-page) and a 1 b.\n\n```\nhidden code\n```")
+        info = document_info(document, ("search",), document.title)
+        self.assertEqual(info, {"title": "The Ring", "terms": ["and", "mordor", "ring", "see", "the"]})
+
+    def test_references_keep_line_numbers_and_skip_code(self):
+        document = parse_document([
+            "# Title",
+            "See [home](/) and **[bold](/b)** ![pic](img/a.png)",
+            "```",
+            "[not a link](/code)",
+            "```",
+            "`[inline](/code)` [post](../post)",
+        ])
+        self.assertEqual(document_info(document, ("links",))["references"], [
+            [2, "link", "/"],
+            [2, "link", "/b"],
+            [2, "image", "img/a.png"],
+            [6, "link", "../post"],
+        ])
+
+    def test_collections_count_words_and_headings(self):
+        markdown = "# Zebra\n\n## Intro\n\none two\nthree\n\n- a *b*\n"
+        info = document_info(parse_document(markdown), ("collections",), "Zebra")
+        self.assertEqual(info, {"title": "Zebra", "headings": [(1, "Zebra"), (2, "Intro")], "words": 7})
+        self.assertEqual(info["words"], count_words(markdown))
+
+    def test_streamed_blocks_match_document(self):
+        markdown = "# Title\n\nA [link](/a)\nand [another](/b)\n\n```\ncode\n\n[x](/x)\n```\n\n> [quote](/q)\n"
+        fields = ("collections", "search", "links")
+        info = PageInfo(fields, "Title")
+        for number, block, block_type in iter_numbered_blocks(markdown.split("\n")):
+            info.add(number, block, block_type)
+        self.assertEqual(info.result(), document_info(parse_document(markdown), fields, "Title"))
+        self.assertEqual([line for line, _, _ in info.references], [3, 4, 12])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,39 @@
+import random
+import threading
+import time
+import unittest
+
+from pipeline import PagePipeline
+
+
+class TestPagePipeline(unittest.TestCase):
+    def test_writes_follow_page_order(self):
+        pages = [(f"{index}.md", f"{index}.html") for index in range(50)]
+        written = []
+        lock = threading.Lock()
+
+        def read(source_file):
+            time.sleep(random.random() / 1000)
+            return source_file.upper()
+
+        def write(source_file, output_file, html):
+            time.sleep(random.random() / 1000)
+            with lock:
+                written.append((output_file, html))
+
+        pipeline = PagePipeline(read_ahead=2, write_behind=1, io_jobs=4)
+        pipeline.run(pages, read, lambda source_file, output_file, data: data + "!", write)
+        self.assertEqual(pipeline.pages, 50)
+        self.assertEqual(pipeline.written, [output_file for _, output_file in pages])
+        self.assertEqual(sorted(written), sorted((f"{index}.html", f"{index}.MD!") for index in range(50)))
+
+    def test_render_errors_name_the_source(self):
+        def render(source_file, output_file, data):
+            raise ValueError("boom")
+
+        with self.assertRaisesRegex(Exception, "Failed to render a.md: boom"):
+            PagePipeline().run([("a.md", "a.html")], lambda source_file: "", render, lambda *args: None)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,76 @@
+import json
+import os
+import tempfile
+import unittest
+
+from search import SearchIndex, delta_encode
+
+
+class TestDeltaEncode(unittest.TestCase):
+    def test_delta_encode(self):
+        self.assertEqual(delta_encode([2, 3, 7, 20]), [2, 1, 4, 13])
+
+
+class TestSearchIndex(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.output = os.path.join(self.tmp.name, "docs")
+        self.state = os.path.join(self.tmp.name, "cache", "search.json")
+        self.sources = {}
+        for name, text in (("a", "# Alpha\n\nshared alpha"), ("b", "# Beta\n\nshared beta")):
+            self.sources[name] = os.path.join(self.tmp.name, f"{name}.md")
+            self.write_source(name, text)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write_source(self, name, text):
+        with open(self.sources[name], "w") as file:
+            file.write(text)
+
+    def build(self, names=("a", "b"), base_path="", prefix_length=2):
+        index = SearchIndex(self.state, self.output, base_path, prefix_length)
+        for name in names:
+            index.update(self.sources[name], f"{name}/index.html")
+        index.retain([f"{name}/index.html" for name in names])
+        outputs = index.write()
+        index.save()
+        return index, outputs
+
+    def shard(self, prefix):
+        with open(os.path.join(self.output, "search", "shards", f"{prefix}.json")) as file:
+            return json.load(file)
+
+    def test_incremental_updates_touch_only_changed_shards(self):
+        index, outputs = self.build()
+        self.assertEqual(self.shard("sh"), {"shared": [0, 1]})
+        self.assertIn(os.path.join(self.output, "search", "shards", "al.json"), outputs)
+        index, _ = self.build()
+        self.assertEqual((index.updated, index.shards_written), (0, 0))
+        self.write_source("b", "# Beta\n\nshared beta gamma")
+        index, _ = self.build()
+        self.assertEqual((index.updated, index.shards_written), (1, 1))
+        self.assertEqual(self.shard("ga"), {"gamma": [1]})
+        index, outputs = self.build(["b"])
+        self.assertEqual(self.shard("sh"), {"shared": [1]})
+        self.assertFalse(os.path.exists(os.path.join(self.output, "search", "shards", "al.json")))
+        self.assertNotIn(os.path.join(self.output, "search", "shards", "al.json"), outputs)
+
+    def test_base_path_change_rebuilds_urls(self):
+        self.build()
+        self.build(base_path="/site/")
+        with open(os.path.join(self.output, "search", "docs.json")) as file:
+            self.assertEqual(json.load(file), [["/site/a", "Alpha"], ["/site/b", "Beta"]])
+
+
+    def test_shards_do_not_collide_with_metadata_files(self):
+        self.write_source("a", "# Index\n\nindex docs")
+        self.build(prefix_length=5)
+        self.assertEqual(self.shard("index"), {"index": [0]})
+        self.assertEqual(self.shard("docs"), {"docs": [0]})
+        with open(os.path.join(self.output, "search", "index.json")) as file:
+            self.assertEqual(json.load(file)["prefix_length"], 5)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,52 @@
+import os
+import tempfile
+import unittest
+
+from sync import AssetSync, replace_with_link, sync_file, COPIED, LINKED, SKIPPED
+
+
+class TestSync(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.source = os.path.join(self.tmp.name, "image.png")
+        self.dest = os.path.join(self.tmp.name, "out.png")
+        with open(self.source, "wb") as file:
+            file.write(b"pixels" * 100)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_copy_then_skip(self):
+        self.assertEqual(sync_file(self.source, self.dest), (COPIED, 600))
+        self.assertEqual(sync_file(self.source, self.dest), (SKIPPED, 0))
+        with open(self.dest, "rb") as file:
+            self.assertEqual(file.read(), b"pixels" * 100)
+
+    def test_changed_content_is_copied_in_hash_mode(self):
+        sync_file(self.source, self.dest)
+        stat = os.stat(self.source)
+        with open(self.dest, "wb") as file:
+            file.write(b"PIXELS" * 100)
+        os.utime(self.dest, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+        self.assertEqual(sync_file(self.source, self.dest)[0], SKIPPED)
+        self.assertEqual(sync_file(self.source, self.dest, compare="hash")[0], COPIED)
+
+    def test_link(self):
+        self.assertEqual(sync_file(self.source, self.dest, link=True), (LINKED, 0))
+        self.assertTrue(os.path.samefile(self.source, self.dest))
+
+    def test_relink_same_file_leaves_no_temp(self):
+        self.assertTrue(replace_with_link(self.source, self.dest))
+        self.assertTrue(replace_with_link(self.source, self.dest))
+        self.assertEqual(sorted(os.listdir(self.tmp.name)), ["image.png", "out.png"])
+
+    def test_asset_sync_counts(self):
+        assets = AssetSync()
+        assets.add(self.source, self.dest)
+        assets.finish()
+        self.assertEqual(assets.counts[COPIED], 1)
+        self.assertEqual(assets.bytes_moved, 600)
+
+
+if __name__ == "__main__":
+    unittest.main()
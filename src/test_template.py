@@ -0,0 +1,33 @@
+import unittest
+
+from template import Template
+
+
+class TestTemplate(unittest.TestCase):
+    def test_render_slots(self):
+        template = Template("<title>{{ Title }}</title><p>{{ Content }}</p><i>{{ date }}</i>")
+        self.assertEqual(
+            template.render(Title="Hi", Content="Body", date="2024-01-01"),
+            "<title>Hi</title><p>Body</p><i>2024-01-01</i>",
+        )
+
+    def test_unknown_slot_is_left_alone(self):
+        template = Template("{{ Title }} {{ Unknown }}")
+        self.assertEqual(template.render(Title="Hi"), "Hi {{ Unknown }}")
+
+    def test_base_path_resolved_at_compile_time(self):
+        template = Template('<a href=/>home</a><img src=/logo.png>{{ Content }}', "/site/")
+        self.assertEqual(template.pieces[0], '<a href=/site/>home</a><img src=/site/logo.png>')
+        self.assertEqual(template.render(Content="x"), '<a href=/site/>home</a><img src=/site/logo.png>x')
+
+    def test_base_path_slot(self):
+        template = Template('<base href="{{ base_path }}">', "/site/")
+        self.assertEqual(template.render(), '<base href="/site/">')
+
+    def test_rewrite_urls(self):
+        template = Template("", "/site/")
+        self.assertEqual(template.rewrite_urls("<a href=/blog>b</a>"), "<a href=/site/blog>b</a>")
+
+
+if __name__ == "__main__":
+    unittest.main()
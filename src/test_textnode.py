@@ -1,3 +1,4 @@
+import io
 import unittest
 
 from textnode import TextNode, TextType
@@ -66,6 +67,13 @@ class TestLeafNode(unittest.TestCase):
             "<div><span><b>grandchild</b></span></div>",
         )
 
+    def test_write_html_streams_chunks(self):
+        parent_node = ParentNode("div", [ParentNode("p", [LeafNode(None, "a"), LeafNode("b", "b")])])
+        chunks = []
+        parent_node.write_html(chunks.append)
+        self.assertEqual(chunks, ["<div>", "<p>", "a", "<b>b</b>", "</p>", "</div>"])
+        self.assertEqual("".join(chunks), parent_node.to_html())
+
 class TestTextSplitting(unittest.TestCase):
     def test_split_nodes_delimiter_basic(self):
         node = TextNode("This is *italic* text", TextType.TEXT)
@@ -133,6 +141,38 @@ class TestTextSplitting(unittest.TestCase):
             nodes
         )
 
+    def test_text_to_textnodes_multiple_pairs(self):
+        nodes = text_to_textnodes("_one_ and _two_ and **three** and **four**")
+        self.assertListEqual(
+            [
+                TextNode("one", TextType.ITALIC),
+                TextNode(" and ", TextType.TEXT),
+                TextNode("two", TextType.ITALIC),
+                TextNode(" and ", TextType.TEXT),
+                TextNode("three", TextType.BOLD),
+                TextNode(" and ", TextType.TEXT),
+                TextNode("four", TextType.BOLD),
+            ],
+            nodes
+        )
+
+    def test_text_to_textnodes_code_is_literal(self):
+        nodes = text_to_textnodes("run `a_b_c **x**` now")
+        self.assertListEqual(
+            [
+                TextNode("run ", TextType.TEXT),
+                TextNode("a_b_c **x**", TextType.CODE),
+                TextNode(" now", TextType.TEXT),
+            ],
+            nodes
+        )
+
+    def test_text_to_textnodes_nested(self):
+        nodes = text_to_textnodes("**bold _and italic_**")
+        self.assertListEqual([TextNode("bold _and italic_", TextType.BOLD)], nodes)
+        html = text_node_to_html(nodes[0]).to_html()
+        self.assertEqual(html, "<b>bold <i>and italic</i></b>")
+
     def test_markdown_to_blocks(self):
         md = """
     This is **bolded** paragraph
@@ -152,6 +192,22 @@ class TestTextSplitting(unittest.TestCase):
                 "- This is a list\n- with items",
             ],
         )
+
+    def test_fenced_code_keeps_blank_lines(self):
+        lines = io.StringIO("# Title\n\n```\nfirst\n\n    second\n```\n\n- a\n- b\n")
+        self.assertEqual(
+            list(iter_typed_blocks(lines)),
+            [
+                ("# Title", BlockType.HEADING),
+                ("```\nfirst\n\n    second\n```", BlockType.CODE),
+                ("- a\n- b", BlockType.UNORDERED_LIST),
+            ],
+        )
+        self.assertEqual(
+            code_block_to_html("```\nfirst\n\n    second\n```").to_html(),
+            "<pre><code>first\n\n    second\n</code></pre>",
+        )
+
 def test_block_to_block_Types(self):
     md = """
         # Heading 1
@@ -13,7 +13,17 @@ class BlockType(Enum):
     UNORDERED_LIST = "unordered_list"
     ORDERED_LIST = "ordered_list"
 
-    
+
+INLINE_PATTERN = re.compile(
+    r"(?P<ticks>`+)(?P<code>.*?)(?P=ticks)"
+    r"|!\[(?P<alt>[^\[\]]*)\]\s*\((?P<src>[^()]*)\)"
+    r"|\[(?P<link>[^\[\]]*)\]\s*\((?P<href>[^()]*)\)"
+    r"|\*\*(?P<bold>.+?)\*\*"
+    r"|_(?P<italic>.+?)_",
+    re.DOTALL,
+)
+
+
 def split_nodes_delimiter(old_nodes, delimiter, text_type):
     result = []
     for node in old_nodes:
@@ -98,24 +108,86 @@ def split_nodes_link(old_nodes):
     return result
 
 def text_to_textnodes(text):
-    nodes = [TextNode(text, TextType.TEXT)]
-    nodes = split_nodes_delimiter(nodes, "**", TextType.BOLD)
-    nodes = split_nodes_delimiter(nodes, "**", TextType.BOLD)
-    nodes = split_nodes_delimiter(nodes, "_", TextType.ITALIC)
-    nodes = split_nodes_delimiter(nodes, "`", TextType.CODE)
-    nodes = split_nodes_image(nodes)
-    nodes = split_nodes_link(nodes)
+    nodes = []
+    position = 0
+    for match in INLINE_PATTERN.finditer(text):
+        if match.start() > position:
+            nodes.append(TextNode(text[position:match.start()], TextType.TEXT))
+        kind = match.lastgroup
+        if kind == "code":
+            nodes.append(TextNode(match.group("code"), TextType.CODE))
+        elif kind == "src":
+            nodes.append(TextNode(match.group("alt"), TextType.IMAGE, match.group("src")))
+        elif kind == "href":
+            nodes.append(TextNode(match.group("link"), TextType.LINK, match.group("href")))
+        elif kind == "bold":
+            nodes.append(TextNode(match.group("bold"), TextType.BOLD))
+        else:
+            nodes.append(TextNode(match.group("italic"), TextType.ITALIC))
+        position = match.end()
+    if position < len(text) or not nodes:
+        nodes.append(TextNode(text[position:], TextType.TEXT))
     return nodes
 
+def classify_block(lines):
+    first = lines[0]
+    if first.startswith("#") and len(first.split()[0]) <= 6:
+        return BlockType.HEADING
+    if first.startswith("```") and lines[-1].endswith("```"):
+        return BlockType.CODE
+    unordered = ordered = quote = True
+    for i, line in enumerate(lines):
+        unordered = unordered and line.startswith("- ")
+        ordered = ordered and line.startswith(f"{i+1}. ")
+        quote = quote and line.startswith(">")
+        if not (unordered or ordered or quote):
+            return BlockType.PARAGRAPH
+    if unordered:
+        return BlockType.UNORDERED_LIST
+    if ordered:
+        return BlockType.ORDERED_LIST
+    return BlockType.QUOTE
+
+def iter_numbered_blocks(lines):
+    block = []
+    start = 0
+    fenced = False
+    for number, raw_line in enumerate(lines, 1):
+        raw_line = raw_line.rstrip("\r\n")
+        line = raw_line.strip()
+        if fenced:
+            block.append(line if line.startswith("```") else raw_line)
+            if line.startswith("```"):
+                yield start, "\n".join(block), BlockType.CODE
+                block = []
+                fenced = False
+            continue
+        if line.startswith("```"):
+            if block:
+                yield start, "\n".join(block), classify_block(block)
+            block = [line]
+            start = number
+            fenced = len(line) < 6 or not line.endswith("```")
+            if not fenced:
+                yield start, line, BlockType.CODE
+                block = []
+            continue
+        if line:
+            if not block:
+                start = number
+            block.append(line)
+        elif block:
+            yield start, "\n".join(block), classify_block(block)
+            block = []
+    if block:
+        yield start, "\n".join(block), classify_block(block)
+
+def iter_typed_blocks(lines):
+    for _, block, block_type in iter_numbered_blocks(lines):
+        yield block, block_type
+
 def markdown_to_blocks(markdown):
-    blocks = markdown.split("\n\n")
-    cleaned_blocks = []
-    for block in blocks:
-        lines = [line.strip() for line in block.split("\n")]
-        cleaned_block = "\n".join(line for line in lines if line)
-        if cleaned_block:
-            cleaned_blocks.append(cleaned_block)
-    return cleaned_blocks
+    return [block for block, _ in iter_typed_blocks(markdown.split("\n"))]
 
 def is_block_a_heading(block):
     if block.startswith("#"):
@@ -143,30 +215,24 @@ def is_block_an_ordered_list(block):
 
     
 def block_to_block_type(block):
-    if is_block_a_heading(block):
-        return BlockType.HEADING
-    elif is_block_a_code_snippet(block):
-        return BlockType.CODE
-    elif is_block_an_unordered_list(block):
-        return BlockType.UNORDERED_LIST
-    elif is_block_an_ordered_list(block):
-        return BlockType.ORDERED_LIST
-    elif is_block_a_quote(block):
-        return BlockType.QUOTE
-    else: 
-        return BlockType.PARAGRAPH
+    return classify_block(block.split("\n"))
     
 def text_node_to_html(node: TextNode):
-    html_map = {
-        TextType.TEXT: LeafNode(None, node.text),
-        TextType.BOLD: LeafNode("b", node.text),
-        TextType.ITALIC: LeafNode("i", node.text),
-        TextType.CODE: LeafNode("code", node.text),
-        TextType.LINK: LeafNode("a", node.text, f"href={node.url}"),
-        TextType.IMAGE: LeafNode("img", "", f"src={node.url} alt={node.text}")
-    }
-    
-    return html_map.get(node.text_type)
+    text_type = node.text_type
+    if text_type is TextType.TEXT:
+        return LeafNode(None, node.text)
+    if text_type is TextType.BOLD or text_type is TextType.ITALIC:
+        tag = "b" if text_type is TextType.BOLD else "i"
+        if INLINE_PATTERN.search(node.text):
+            return ParentNode(tag, [text_node_to_html(child) for child in text_to_textnodes(node.text)])
+        return LeafNode(tag, node.text)
+    if text_type is TextType.CODE:
+        return LeafNode("code", node.text)
+    if text_type is TextType.LINK:
+        return LeafNode("a", node.text, f"href={node.url}")
+    if text_type is TextType.IMAGE:
+        return LeafNode("img", "", f"src={node.url} alt={node.text}")
+    return None
     
 
 def heading_block_to_html(block):
@@ -184,12 +250,12 @@ def heading_block_to_html(block):
     return ParentNode(f"h{heading_level}", children)
 
 def code_block_to_html(block):
-    nodes = text_to_textnodes(block)
-    children = []
-    for node in nodes :
-        html_snippet = text_node_to_html(node)
-        children.append(html_snippet) 
-    return ParentNode("pre", [ParentNode("code", children)])
+    lines = block.split("\n")
+    if len(lines) == 1:
+        code = block.strip("`")
+    else:
+        code = "\n".join(lines[1:-1]) + "\n"
+    return ParentNode("pre", [ParentNode("code", [LeafNode(None, code)])])
 
 def quote_block_to_html(block):
     lines = block.split("\n")
@@ -256,20 +322,33 @@ def block_to_html(block, block_type):
         return convert_func(block)
     return None
 
-def markdown_to_html_node(markdown):
-    blocks = markdown_to_blocks(markdown)
+def markdown_to_typed_blocks(markdown):
+    return list(iter_typed_blocks(markdown.split("\n")))
+
+def typed_blocks_to_html_tree(typed_blocks):
     children = []
-    for block in blocks:
-        block_type = block_to_block_type(block)
+    for block, block_type in typed_blocks:
         html_node = block_to_html(block, block_type)
         if html_node:
             children.append(html_node)
-    return ParentNode("div", children).to_html()
+    return ParentNode("div", children)
 
-def extract_title(markdown):        
-    blocks = markdown_to_blocks(markdown)
-    for block in blocks:
-        block_type = block_to_block_type(block)
+def write_typed_blocks_html(typed_blocks, write):
+    write("<div>")
+    for block, block_type in typed_blocks:
+        html_node = block_to_html(block, block_type)
+        if html_node:
+            html_node.write_html(write)
+    write("</div>")
+
+def markdown_to_html_tree(markdown):
+    return typed_blocks_to_html_tree(markdown_to_typed_blocks(markdown))
+
+def markdown_to_html_node(markdown):
+    return markdown_to_html_tree(markdown).to_html()
+
+def title_from_typed_blocks(typed_blocks):
+    for block, block_type in typed_blocks:
         if block_type == BlockType.HEADING:
             words = block.split()
             if len(words[0]) == 1:
@@ -279,7 +358,8 @@ def extract_title(markdown):
                     html_node = text_node_to_html(node)
                     if html_node:
                         return html_node.to_html()
-                
-            
+
     raise Exception("No Title were found")
 
+def extract_title(markdown):
+    return title_from_typed_blocks(iter_typed_blocks(markdown.split("\n")))